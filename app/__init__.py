@@ -0,0 +1,3 @@
+from pathlib import Path
+
+PACKAGE_DIR = Path(__file__).parent
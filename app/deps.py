@@ -1,26 +1,43 @@
-from pathlib import Path
-from typing import Annotated
-
-from fastapi import Depends
+import threading
+from typing import Optional
 
+from app import PACKAGE_DIR
 from app.services.config_service import ConfigService
 from app.services.dataset_manager import DatasetManager
 from app.services.lmstudio_service import LmStudioService
 
-config_service = ConfigService(base_dir=Path(__file__).resolve().parent.parent / "config")
-dataset_manager = DatasetManager(config_service=config_service)
-lm_studio_service = LmStudioService()
+CONFIG_DIR = PACKAGE_DIR.parent / "config"
+
+# FastAPI resolves sync dependencies on its threadpool, so concurrent first requests
+# must not each build their own instance; construction is serialised on this lock.
+_build_lock = threading.RLock()
+_config_service: Optional[ConfigService] = None
+_dataset_manager: Optional[DatasetManager] = None
+_lm_studio_service: Optional[LmStudioService] = None
 
 
 def get_config_service() -> ConfigService:
-    return config_service
+    global _config_service
+    if _config_service is None:
+        with _build_lock:
+            if _config_service is None:
+                _config_service = ConfigService(base_dir=CONFIG_DIR)
+    return _config_service
 
 
-def get_dataset_manager(
-    _: Annotated[ConfigService, Depends(get_config_service)]
-) -> DatasetManager:
-    return dataset_manager
+def get_dataset_manager() -> DatasetManager:
+    global _dataset_manager
+    if _dataset_manager is None:
+        with _build_lock:
+            if _dataset_manager is None:
+                _dataset_manager = DatasetManager(config_service=get_config_service())
+    return _dataset_manager
 
 
 def get_lm_studio_service() -> LmStudioService:
-    return lm_studio_service
+    global _lm_studio_service
+    if _lm_studio_service is None:
+        with _build_lock:
+            if _lm_studio_service is None:
+                _lm_studio_service = LmStudioService()
+    return _lm_studio_service
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+
+def write_atomic(path: Path, content: bytes) -> None:
+    # Write beside the target and rename over it, so readers never see a partial file.
+    # The temp name is unique per process and thread so concurrent writers cannot collide.
+    temp_path = path.with_suffix(f"{path.suffix}.{os.getpid()}.{threading.get_ident()}.tmp")
+    temp_path.write_bytes(content)
+    os.replace(temp_path, path)
@@ -1,27 +1,30 @@
-from pathlib import Path
+import os
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
+from app import PACKAGE_DIR
 from app.routes import api, html, images
 
-app = FastAPI(title="SDXL Dataset Tag Tidy")
+app = FastAPI(title="SDXL Dataset Tag Tidy", default_response_class=ORJSONResponse)
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=False,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# The UI is served same-origin, so CORS is only needed for external clients.
+if os.getenv("TAG_TIDY_CORS"):
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=False,
+        allow_methods=["GET", "POST"],
+        allow_headers=["content-type", "hx-request", "hx-target", "hx-trigger", "hx-current-url"],
+    )
 
 app.include_router(html.router)
 app.include_router(api.router, prefix="/api")
 app.include_router(images.router)
 
-static_path = Path(__file__).resolve().parent / "static"
+static_path = PACKAGE_DIR / "static"
 app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
 
 
@@ -33,8 +36,8 @@ def healthcheck():
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     if isinstance(exc.detail, dict) and "error" in exc.detail:
-        return JSONResponse(status_code=exc.status_code, content=exc.detail)
-    return JSONResponse(
+        return ORJSONResponse(status_code=exc.status_code, content=exc.detail)
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"error": {"code": "HTTP_ERROR", "message": str(exc.detail)}},
     )
@@ -2,13 +2,16 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 
-IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp"}
+IMAGE_EXTENSIONS: FrozenSet[str] = frozenset({".png", ".jpg", ".jpeg", ".webp"})
+IMAGE_EXTENSIONS_TUPLE = tuple(sorted(IMAGE_EXTENSIONS))
+_TRUE_STRINGS = frozenset({"true", "1", "yes", "on"})
+_FALSE_STRINGS = frozenset({"false", "0", "no", "off"})
 
 
-@dataclass
+@dataclass(slots=True)
 class ImageData:
     image_id: str
     rel_path: str
@@ -16,15 +19,48 @@ class ImageData:
     tags_original: List[str]
     tags_current: List[str]
     is_complete: bool = False
+    # Derived lookups, dropped whenever the tag lists are reassigned. Mutate the
+    # tag lists by assignment rather than in place so these stay in sync.
+    _original_set: Optional[FrozenSet[str]] = field(default=None, init=False, repr=False, compare=False)
+    _current_set: Optional[FrozenSet[str]] = field(default=None, init=False, repr=False, compare=False)
+    _current_lower: Optional[Tuple[str, ...]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        object.__setattr__(self, name, value)
+        if name == "tags_current":
+            object.__setattr__(self, "_current_set", None)
+            object.__setattr__(self, "_current_lower", None)
+        elif name == "tags_original":
+            object.__setattr__(self, "_original_set", None)
+
+    @property
+    def original_set(self) -> FrozenSet[str]:
+        if self._original_set is None:
+            self._original_set = frozenset(self.tags_original)
+        return self._original_set
+
+    @property
+    def current_set(self) -> FrozenSet[str]:
+        if self._current_set is None:
+            self._current_set = frozenset(self.tags_current)
+        return self._current_set
+
+    @property
+    def tags_current_lower(self) -> Tuple[str, ...]:
+        if self._current_lower is None:
+            self._current_lower = tuple(tag.lower() for tag in self.tags_current)
+        return self._current_lower
 
     def is_dirty(self) -> bool:
         return self.tags_original != self.tags_current
 
     def added_tags(self) -> List[str]:
-        return [t for t in self.tags_current if t not in self.tags_original]
+        original = self.original_set
+        return [t for t in self.tags_current if t not in original]
 
     def removed_tags(self) -> List[str]:
-        return [t for t in self.tags_original if t not in self.tags_current]
+        current = self.current_set
+        return [t for t in self.tags_original if t not in current]
 
     def reordered(self) -> bool:
         if self.added_tags() or self.removed_tags():
@@ -32,7 +68,7 @@ class ImageData:
         return self.tags_original != self.tags_current
 
 
-@dataclass
+@dataclass(slots=True)
 class DatasetSummary:
     dataset_rel: str
     image_count: int
@@ -40,22 +76,38 @@ class DatasetSummary:
     images: List[Dict[str, object]] = field(default_factory=list)
     warnings: List[str] = field(default_factory=list)
 
+    def to_dict(self) -> Dict[str, object]:
+        # Payload entries are already plain JSON-ready dicts; avoid asdict()'s deep copy.
+        return {
+            "dataset_rel": self.dataset_rel,
+            "image_count": self.image_count,
+            "tags": self.tags,
+            "images": self.images,
+            "warnings": self.warnings,
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class ChangeEntry:
     image_id: str
     added: List[str] = field(default_factory=list)
     removed: List[str] = field(default_factory=list)
     reordered: bool = False
 
+    def to_dict(self) -> Dict[str, object]:
+        return {"image_id": self.image_id, "added": self.added, "removed": self.removed, "reordered": self.reordered}
+
 
-@dataclass
+@dataclass(slots=True)
 class ChangeSummary:
     dirty_images: int
     changes: List[ChangeEntry]
 
+    def to_dict(self) -> Dict[str, object]:
+        return {"dirty_images": self.dirty_images, "changes": [change.to_dict() for change in self.changes]}
+
 
-@dataclass
+@dataclass(slots=True)
 class ThumbnailCacheSettings:
     enabled: bool = False
     mode: str = "disk"
@@ -71,7 +123,7 @@ class ThumbnailCacheSettings:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class LMStudioSettings:
     enabled: bool = False
     base_url: str = "http://localhost:1234"
@@ -95,7 +147,7 @@ class LMStudioSettings:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class FilterCriteria:
     filename_contains: Optional[str] = None
     has_tag: Optional[str] = None
@@ -115,18 +167,25 @@ class FilterCriteria:
             is_complete=cls._coerce_bool(data.get("is_complete")),
         )
 
+    def is_empty(self) -> bool:
+        return (
+            not self.filename_contains
+            and not self.has_tag
+            and self.has_undesired is None
+            and self.has_missing_required is None
+            and self.is_complete is None
+        )
+
     @staticmethod
     def _coerce_bool(value: object) -> Optional[bool]:
-        if value is None:
-            return None
         if isinstance(value, bool):
             return value
         if isinstance(value, str):
-            lowered = value.lower()
-            if lowered == "":
+            if not value:
                 return None
-            if lowered in {"true", "1", "yes", "on"}:
+            lowered = value if value.islower() else value.lower()
+            if lowered in _TRUE_STRINGS:
                 return True
-            if lowered in {"false", "0", "no", "off", ""}:
+            if lowered in _FALSE_STRINGS:
                 return False
         return None
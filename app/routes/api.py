@@ -1,15 +1,27 @@
 from __future__ import annotations
 
-from dataclasses import asdict
+import re
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Awaitable, Callable, Dict, Type, TypeVar
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ValidationError
+from starlette.datastructures import FormData
 
 from fastapi.templating import Jinja2Templates
 
+from app import PACKAGE_DIR
 from app.deps import get_config_service, get_dataset_manager, get_lm_studio_service
+from app.schemas import (
+    AnalyzeActionPayload,
+    BulkOpPayload,
+    CompletePayload,
+    DatasetLoadPayload,
+    DatasetRootPayload,
+    ImageOpPayload,
+    TagPayload,
+)
 from app.services.config_service import ConfigService
 from app.services.dataset_manager import DatasetManager
 from app.services.lmstudio_service import (
@@ -18,23 +30,43 @@ from app.services.lmstudio_service import (
     LmStudioService,
     LmStudioTimeoutError,
 )
+from app.services.tag_service import TagService
 
 router = APIRouter()
-templates = Jinja2Templates(directory=str(Path(__file__).resolve().parent.parent / "templates"))
+templates = Jinja2Templates(directory=str(PACKAGE_DIR / "templates"))
+
+PayloadT = TypeVar("PayloadT", bound=BaseModel)
+_BRACKET_KEY = re.compile(r"^([^\[]+)\[([^\]]+)\]$")
+
+
+def payload_of(model: Type[PayloadT]) -> Callable[[Request], Awaitable[PayloadT]]:
+    """Build a dependency that validates a JSON or HTMX form body into ``model``."""
 
+    async def dependency(request: Request) -> PayloadT:
+        content_type = request.headers.get("content-type", "")
+        if "application/json" in content_type:
+            raw = await request.json()
+        else:
+            raw = _form_to_dict(await request.form())
+        try:
+            return model.model_validate(raw)
+        except ValidationError as exc:
+            first = exc.errors()[0]
+            field = ".".join(str(part) for part in first.get("loc", ())) or "body"
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"error": {"code": "INVALID_PAYLOAD", "message": f"{field}: {first.get('msg')}"}},
+            ) from exc
+
+    return dependency
 
-async def _coerce_payload(request: Request) -> Dict[str, Any]:
-    content_type = request.headers.get("content-type", "")
-    if "application/json" in content_type:
-        return await request.json()
-    form = await request.form()
+
+def _form_to_dict(form: FormData) -> Dict[str, Any]:
     data: Dict[str, Any] = {}
     for key, value in form.multi_items():
-        if "[" in key and key.endswith("]"):
-            base, inner = key.split("[", 1)
-            inner = inner.rstrip("]")
-            bucket = data.setdefault(base, {})
-            bucket[inner] = value
+        nested = _BRACKET_KEY.match(key)
+        if nested:
+            data.setdefault(nested.group(1), {})[nested.group(2)] = value
         else:
             if key in data:
                 existing = data[key]
@@ -54,20 +86,19 @@ def browse(rel: str | None = None, manager: DatasetManager = Depends(get_dataset
 
 @router.post("/config/dataset-root")
 async def set_dataset_root(
-    request: Request,
+    payload: DatasetRootPayload = Depends(payload_of(DatasetRootPayload)),
     manager: DatasetManager = Depends(get_dataset_manager),
     config: ConfigService = Depends(get_config_service),
 ):
-    payload = await _coerce_payload(request)
-    root_value = (payload.get("dataset_root") or "").strip()
+    root_value = payload.dataset_root.strip()
     if not root_value:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"error": {"code": "INVALID_ROOT", "message": "Dataset root is required."}},
         )
     root_path = Path(root_value)
     if not root_path.exists() or not root_path.is_dir():
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"error": {"code": "INVALID_ROOT", "message": "Dataset root must be an existing folder."}},
         )
@@ -77,17 +108,18 @@ async def set_dataset_root(
 
 
 @router.post("/dataset/load")
-async def load_dataset(request: Request, manager: DatasetManager = Depends(get_dataset_manager)):
-    payload = await _coerce_payload(request)
-    rel = payload.get("rel") or ""
-    summary = manager.load_dataset(rel)
+async def load_dataset(
+    payload: DatasetLoadPayload = Depends(payload_of(DatasetLoadPayload)),
+    manager: DatasetManager = Depends(get_dataset_manager),
+):
+    summary = manager.load_dataset(payload.rel)
     return summary
 
 
 @router.get("/dataset/summary")
-def dataset_summary(manager: DatasetManager = Depends(get_dataset_manager)):
-    summary = manager.get_dataset_summary()
-    return asdict(summary)
+def dataset_summary(include_hints: bool = True, manager: DatasetManager = Depends(get_dataset_manager)):
+    summary = manager.get_dataset_summary(include_hints=include_hints)
+    return summary.to_dict()
 
 
 @router.get("/image/{image_id}/tags")
@@ -104,8 +136,6 @@ def hint_options(
     manager: DatasetManager = Depends(get_dataset_manager),
 ):
     manager.get_image(image_id)
-    from app.services.tag_service import TagService
-
     options = TagService.hint_options(category)
     return templates.TemplateResponse(
         "fragments/hint_options.html",
@@ -121,44 +151,42 @@ def hint_options(
 
 
 @router.post("/ops/bulk")
-async def bulk_op(request: Request, manager: DatasetManager = Depends(get_dataset_manager)):
-    payload = await _coerce_payload(request)
-    scope = payload.get("scope") or {}
-    op = payload.get("op") or {}
+async def bulk_op(
+    payload: BulkOpPayload = Depends(payload_of(BulkOpPayload)),
+    manager: DatasetManager = Depends(get_dataset_manager),
+):
+    scope = payload.scope.model_dump(exclude_none=True)
     # Map filter fields when originating from the filters form
     if "filter" not in scope:
         scope["filter"] = {
-            "filename_contains": payload.get("filename_contains") or None,
-            "has_tag": payload.get("has_tag") or None,
-            "has_undesired": payload.get("has_undesired") in ("true", True),
-            "has_missing_required": payload.get("has_missing_required") in ("true", True),
-            "is_complete": payload.get("is_complete") or None,
+            "filename_contains": payload.filename_contains or None,
+            "has_tag": payload.has_tag or None,
+            "has_undesired": payload.has_undesired in ("true", True),
+            "has_missing_required": payload.has_missing_required in ("true", True),
+            "is_complete": payload.is_complete or None,
         }
-    if "selected_image_ids" not in scope and payload.get("selected_image_ids"):
-        ids = payload.get("selected_image_ids")
-        if not isinstance(ids, list):
-            ids = [ids]
-        scope["selected_image_ids"] = ids
-    result = manager.stage_bulk_edit(scope, op)
+    if "selected_image_ids" not in scope and payload.selected_image_ids:
+        scope["selected_image_ids"] = payload.selected_image_ids
+    result = manager.stage_bulk_edit(scope, payload.op.model_dump())
     return result
 
 
 @router.post("/image/{image_id}/ops")
-async def image_op(image_id: str, request: Request, manager: DatasetManager = Depends(get_dataset_manager)):
-    payload = await _coerce_payload(request)
-    return manager.stage_image_edit(image_id, payload)
+async def image_op(
+    image_id: str,
+    payload: ImageOpPayload = Depends(payload_of(ImageOpPayload)),
+    manager: DatasetManager = Depends(get_dataset_manager),
+):
+    return manager.stage_image_edit(image_id, payload.model_dump())
 
 
 @router.post("/image/{image_id}/complete")
-async def image_complete(image_id: str, request: Request, manager: DatasetManager = Depends(get_dataset_manager)):
-    payload = await _coerce_payload(request)
-    complete_raw = payload.get("complete")
-    complete = False
-    if isinstance(complete_raw, bool):
-        complete = complete_raw
-    elif isinstance(complete_raw, str):
-        complete = complete_raw.lower() in {"true", "1", "yes", "on"}
-    return manager.set_image_complete(image_id, complete)
+async def image_complete(
+    image_id: str,
+    payload: CompletePayload = Depends(payload_of(CompletePayload)),
+    manager: DatasetManager = Depends(get_dataset_manager),
+):
+    return manager.set_image_complete(image_id, payload.complete)
 
 
 @router.get("/image/{image_id}/analyze")
@@ -175,12 +203,14 @@ def analyze_image(
 
 
 @router.post("/image/{image_id}/analyze")
-async def analyze_action(image_id: str, request: Request, manager: DatasetManager = Depends(get_dataset_manager)):
-    payload = await _coerce_payload(request)
-    action = payload.get("action") or ""
-    tags = payload.get("tags") or []
-    if isinstance(tags, str):
-        tags = [tags]
+async def analyze_action(
+    image_id: str,
+    request: Request,
+    payload: AnalyzeActionPayload = Depends(payload_of(AnalyzeActionPayload)),
+    manager: DatasetManager = Depends(get_dataset_manager),
+):
+    action = payload.action
+    tags = payload.tags
 
     if action == "stage_adds" and tags:
         manager.stage_image_edit(image_id, {"type": "add_many", "tags": tags})
@@ -205,7 +235,7 @@ async def analyze_action(image_id: str, request: Request, manager: DatasetManage
 @router.get("/changes")
 def changes(manager: DatasetManager = Depends(get_dataset_manager)):
     summary = manager.get_changes()
-    return asdict(summary)
+    return summary.to_dict()
 
 
 @router.post("/changes/apply")
@@ -220,13 +250,15 @@ async def discard_changes(manager: DatasetManager = Depends(get_dataset_manager)
 
 @router.get("/undesired")
 def undesired(config: ConfigService = Depends(get_config_service)):
-    return {"tags": config.load_undesired_tags()}
+    return {"tags": config.undesired_tags}
 
 
 @router.post("/undesired/add")
-async def undesired_add(request: Request, config: ConfigService = Depends(get_config_service)):
-    payload = await _coerce_payload(request)
-    tag = (payload.get("tag") or "").strip()
+async def undesired_add(
+    payload: TagPayload = Depends(payload_of(TagPayload)),
+    config: ConfigService = Depends(get_config_service),
+):
+    tag = payload.tag.strip()
     tags = config.load_undesired_tags()
     if tag and tag not in tags:
         tags.append(tag)
@@ -235,10 +267,12 @@ async def undesired_add(request: Request, config: ConfigService = Depends(get_co
 
 
 @router.post("/undesired/remove")
-async def undesired_remove(request: Request, config: ConfigService = Depends(get_config_service)):
-    payload = await _coerce_payload(request)
-    tag = (payload.get("tag") or "").strip()
-    tags = [t for t in config.load_undesired_tags() if t != tag]
+async def undesired_remove(
+    payload: TagPayload = Depends(payload_of(TagPayload)),
+    config: ConfigService = Depends(get_config_service),
+):
+    tag = payload.tag.strip()
+    tags = [t for t in config.undesired_tags if t != tag]
     config.save_undesired_tags(tags)
     return {"ok": True}
 
@@ -250,19 +284,8 @@ async def analyze_image(
     config: ConfigService = Depends(get_config_service),
     lm_service: LmStudioService = Depends(get_lm_studio_service),
 ):
-    try:
-        manager.require_loaded()
-    except HTTPException as exc:
-        if exc.status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
-            raise HTTPException(status.HTTP_409_CONFLICT, detail=exc.detail)
-        raise
-
-    try:
-        image = manager.get_image(image_id)
-    except HTTPException:
-        raise
-
-    exclusions = config.load_undesired_tags()
+    image = manager.get_loaded_image(image_id)
+    exclusions = config.undesired_tags
 
     try:
         suggested_tags = await lm_service.analyze_image(image.abs_path, image.tags_current, exclusions=exclusions)
@@ -282,10 +305,12 @@ async def analyze_image(
             detail={"error": {"code": "LM_ERROR", "message": str(exc)}},
         ) from exc
 
-    current_lower = [tag.lower() for tag in image.tags_current]
+    current_lower = set(image.tags_current_lower)
     suggested_set = set(suggested_tags)
     added = [tag for tag in suggested_tags if tag not in current_lower]
-    removed = [tag for tag in image.tags_current if tag.lower() not in suggested_set]
+    removed = [
+        tag for tag, lowered in zip(image.tags_current, image.tags_current_lower) if lowered not in suggested_set
+    ]
 
     return {
         "image_id": image_id,
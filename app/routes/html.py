@@ -1,21 +1,21 @@
 from __future__ import annotations
 
-from dataclasses import asdict
-from pathlib import Path
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
 
+from app import PACKAGE_DIR
 from app.deps import get_config_service, get_dataset_manager
 from app.models import FilterCriteria
 from app.services.config_service import ConfigService
 from app.services.dataset_manager import DatasetManager
+from app.services.tag_service import TagService
 
 router = APIRouter()
 
-templates = Jinja2Templates(directory=str(Path(__file__).resolve().parent.parent / "templates"))
+templates = Jinja2Templates(directory=str(PACKAGE_DIR / "templates"))
 
 
 @router.get("/")
@@ -74,13 +74,13 @@ def dataset_view(
         }
     )
     summary = manager.get_dataset_summary(filters)
-    changes = asdict(manager.get_changes())
+    changes = manager.get_changes().to_dict()
     context = {
         "request": request,
         "summary": summary,
         "changes": changes,
         "filters": filters,
-        "undesired_tags": config.load_undesired_tags(),
+        "undesired_tags": config.undesired_tags,
     }
     if request.headers.get("HX-Request"):
         return templates.TemplateResponse("fragments/dataset_content.html", context)
@@ -94,10 +94,8 @@ def image_detail(request: Request, image_id: str, manager: DatasetManager = Depe
     except Exception:
         return RedirectResponse("/", status_code=302)
     image = manager.get_image(image_id)
-    from app.services.tag_service import TagService
-
     hints_map = TagService.compute_hints(image.tags_current) if not image.is_complete else {"missing_required": [], "possibly_missing": [], "not_required": [], "info": []}
-    undesired_lookup = {tag.lower() for tag in config.load_undesired_tags()}
+    undesired_lookup = config.undesired_tags_lower
     return templates.TemplateResponse(
         "image_detail.html",
         {
@@ -105,14 +103,14 @@ def image_detail(request: Request, image_id: str, manager: DatasetManager = Depe
             "image": image,
             "hints": hints_map,
             "undesired_tags": undesired_lookup,
-            "neighbors": manager.get_neighbor_ids(image_id),
+            "neighbors": manager.get_neighbor_ids(image.image_id),
         },
     )
 
 
 @router.get("/settings/undesired")
 def undesired_settings(request: Request, config: ConfigService = Depends(get_config_service)):
-    tags = config.load_undesired_tags()
+    tags = config.undesired_tags
     return templates.TemplateResponse(
         "undesired.html",
         {"request": request, "tags": tags},
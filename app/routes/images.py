@@ -1,52 +1,107 @@
 from __future__ import annotations
 
 import io
+import os
+import threading
 from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.responses import FileResponse, Response
 from PIL import Image
 
 from app.deps import get_config_service, get_dataset_manager
+from app.fileio import write_atomic
 from app.services.config_service import ConfigService
 from app.services.dataset_manager import DatasetManager
 
+try:  # pyvips is optional; it needs the libvips shared library at runtime.
+    import pyvips
+except (ImportError, OSError):
+    pyvips = None
+
 router = APIRouter()
 
+_VIPS_SAVE_FORMATS = {
+    ".jpg": ".jpg[Q=85,strip]",
+    ".jpeg": ".jpg[Q=85,strip]",
+    ".webp": ".webp[Q=85,strip]",
+    ".png": ".png[strip]",
+}
+_SUFFIX_TO_MEDIA = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+}
+# Image ids hash the path relative to the loaded folder, so the same URL can name a
+# different file after switching datasets or replacing it on disk. Browsers must
+# therefore revalidate every hit; the weak ETag keeps that a cheap 304.
+_CACHE_CONTROL = "no-cache"
+# Fixed pool of striped locks: bounded memory no matter how many widths or datasets are seen.
+_thumbnail_locks = tuple(threading.Lock() for _ in range(64))
+
 
 def _validate_image_path(image_path: Path, dataset_path: Path) -> None:
-    resolved = image_path.resolve()
-    dataset_resolved = dataset_path.resolve()
+    # dataset_path is already canonical (resolved when the dataset is loaded), but the
+    # image itself may be a symlink, so only the image path needs realpath.
+    image_real = os.path.realpath(image_path)
+    dataset_abs = os.fspath(dataset_path)
     try:
-        resolved.relative_to(dataset_resolved)
+        contained = os.path.commonpath([image_real, dataset_abs]) == dataset_abs
     except ValueError:
-        from fastapi import HTTPException
-
+        contained = False
+    if not contained:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail={"error": {"code": "FORBIDDEN", "message": "Invalid image path."}})
 
 
+def _image_etag(image_path: Path, variant: str = "") -> str:
+    stat = image_path.stat()
+    return f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}{variant}"'
+
+
+def _cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    if etag not in (candidate.strip() for candidate in if_none_match.split(",")):
+        return None
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(etag))
+
+
 @router.get("/img/full/{image_id}")
-def full_image(image_id: str, manager: DatasetManager = Depends(get_dataset_manager)):
-    manager.require_loaded()
+def full_image(image_id: str, request: Request, manager: DatasetManager = Depends(get_dataset_manager)):
     image_path = manager.get_image_absolute_path(image_id)
     dataset_path = manager.dataset_path  # type: ignore[assignment]
     _validate_image_path(image_path, dataset_path)
-    return FileResponse(str(image_path))
+    etag = _image_etag(image_path)
+    cached = _not_modified(request, etag)
+    if cached:
+        return cached
+    return FileResponse(str(image_path), headers=_cache_headers(etag))
 
 
 @router.get("/img/thumb/{image_id}")
 def thumbnail(
     image_id: str,
+    request: Request,
     w: Optional[int] = Query(256, gt=0, le=2048),
     manager: DatasetManager = Depends(get_dataset_manager),
     config: ConfigService = Depends(get_config_service),
 ):
-    manager.require_loaded()
     image_path = manager.get_image_absolute_path(image_id)
     dataset_path = manager.dataset_path  # type: ignore[assignment]
     _validate_image_path(image_path, dataset_path)
     width = w or 256
+    etag = _image_etag(image_path, f"-w{width}")
+    cached = _not_modified(request, etag)
+    if cached:
+        return cached
+    media_type = _SUFFIX_TO_MEDIA.get(image_path.suffix.lower(), "image/png")
 
     cache_settings = config.thumbnail_cache_settings
     cache_file: Optional[Path] = None
@@ -54,17 +109,29 @@ def thumbnail(
         cache_dir = dataset_path / cache_settings.dir_name
         cache_dir.mkdir(parents=True, exist_ok=True)
         cache_file = cache_dir / f"{image_id}_w{width}{image_path.suffix}"
-        if cache_file.exists():
-            return FileResponse(str(cache_file))
+        if not cache_file.exists():
+            # Concurrent requests for the same thumbnail render it once; the rest
+            # wait on the lock and then find the file in place.
+            with _thumbnail_locks[hash(cache_file) % len(_thumbnail_locks)]:
+                if not cache_file.exists():
+                    write_atomic(cache_file, _render_thumbnail(image_path, width))
+        return FileResponse(str(cache_file), media_type=media_type, headers=_cache_headers(etag))
 
-    with Image.open(image_path) as img:
-        img_copy = img.copy()
-        img_copy.thumbnail((width, width))
-        buffer = io.BytesIO()
-        img_copy.save(buffer, format=img_copy.format or "PNG")
-        content = buffer.getvalue()
+    content = _render_thumbnail(image_path, width)
+    return Response(content, media_type=media_type, headers=_cache_headers(etag))
 
-    if cache_file:
-        cache_file.write_bytes(content)
 
-    return Response(content, media_type=f"image/{(image_path.suffix or '.png').lstrip('.')}")
+def _render_thumbnail(image_path: Path, width: int) -> bytes:
+    if pyvips is not None:
+        # Shrink-on-load: libvips only decodes the JPEG/WebP scale it needs.
+        thumb = pyvips.Image.thumbnail(str(image_path), width, height=width, size="down")
+        return thumb.write_to_buffer(_VIPS_SAVE_FORMATS.get(image_path.suffix.lower(), ".png"))
+
+    with Image.open(image_path) as img:
+        image_format = img.format or "PNG"
+        # Thumbnail the freshly opened image (not a copy) so Pillow can use the
+        # JPEG draft mode to decode at a reduced scale.
+        img.thumbnail((width, width))
+        buffer = io.BytesIO()
+        img.save(buffer, format=image_format)
+        return buffer.getvalue()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import Annotated, Any, Dict, List, Optional, Union
+
+from pydantic import BaseModel, BeforeValidator, field_validator
+
+from app.models import FilterCriteria
+
+
+def _as_tag_list(value: object) -> object:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [str(item) for item in value]
+    return value
+
+
+# Form posts send a single value as a plain string rather than a one-item list, and
+# JSON clients have always been allowed to send null or non-string items.
+StringList = Annotated[List[str], BeforeValidator(_as_tag_list)]
+
+
+class DatasetRootPayload(BaseModel):
+    dataset_root: str = ""
+
+
+class DatasetLoadPayload(BaseModel):
+    rel: str = ""
+
+
+class TagPayload(BaseModel):
+    tag: str = ""
+
+
+class CompletePayload(BaseModel):
+    complete: bool = False
+
+    @field_validator("complete", mode="before")
+    @classmethod
+    def _coerce_complete(cls, value: object) -> bool:
+        # Same truthy spellings as the filter form; anything unrecognised means not complete.
+        return FilterCriteria._coerce_bool(value) is True
+
+
+class ImageOpPayload(BaseModel):
+    type: Optional[str] = None
+    tag: Optional[str] = None
+    tags: StringList = []
+    index: Optional[int] = None
+    old_tag: Optional[str] = None
+    new_tag: Optional[str] = None
+
+
+class AnalyzeActionPayload(BaseModel):
+    action: str = ""
+    tags: StringList = []
+
+
+class BulkScope(BaseModel):
+    mode: Optional[str] = None
+    selected_image_ids: Optional[List[str]] = None
+    filter: Optional[Dict[str, Any]] = None
+
+
+class BulkOp(BaseModel):
+    type: Optional[str] = None
+    tag: Optional[str] = None
+    old_tag: Optional[str] = None
+    new_tag: Optional[str] = None
+
+
+class BulkOpPayload(BaseModel):
+    scope: BulkScope = BulkScope()
+    op: BulkOp = BulkOp()
+    selected_image_ids: StringList = []
+    # Flat filter fields submitted alongside the bulk form via hx-include.
+    filename_contains: Optional[str] = None
+    has_tag: Optional[str] = None
+    has_undesired: Union[bool, str, None] = None
+    has_missing_required: Union[bool, str, None] = None
+    is_complete: Union[bool, str, None] = None
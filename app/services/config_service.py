@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-import json
+import copy
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
+import orjson
+
+from app.fileio import write_atomic
 from app.models import LMStudioSettings, ThumbnailCacheSettings
 
 
@@ -29,6 +32,9 @@ class ConfigService:
         self.config_path = self.base_dir / "config.json"
         self.lm_studio_override_path = self.base_dir / "lm_studio.override.json"
         self.undesired_path = self.base_dir / "undesired_tags.json"
+        self._json_cache: Dict[Path, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        self._undesired_cache: Optional[Tuple[Tuple[int, int], Tuple[str, ...]]] = None
+        self._undesired_lower: FrozenSet[str] = frozenset()
         self.base_dir.mkdir(parents=True, exist_ok=True)
         self._ensure_files()
         self.thumbnail_cache_settings = self._load_thumbnail_settings()
@@ -38,22 +44,49 @@ class ConfigService:
         self._load_json_file(self.undesired_path, self.DEFAULT_UNDESIRED)
         self._load_json_file(self.config_path, self.DEFAULT_CONFIG)
 
+    @staticmethod
+    def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_json_cached(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Parse a JSON object file, reusing the last parse while mtime and size are unchanged.
+
+        Returns a copy so callers are free to mutate the result.
+        """
+        stamp = self._file_stamp(path)
+        if stamp is None:
+            self._json_cache.pop(path, None)
+            raise FileNotFoundError(path)
+        cached = self._json_cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return copy.deepcopy(cached[1])
+        data = orjson.loads(path.read_bytes())
+        if not isinstance(data, dict):
+            self._json_cache.pop(path, None)
+            return None
+        self._json_cache[path] = (stamp, data)
+        return copy.deepcopy(data)
+
     def _load_json_file(self, path: Path, default: Dict[str, Any]) -> Dict[str, Any]:
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-            if isinstance(data, dict):
+            data = self._read_json_cached(path)
+            if data is not None:
                 return data
         except Exception:
             pass
         self._write_json_file(path, default)
-        return default
+        return copy.deepcopy(default)
 
     def _load_optional_json(self, path: Path) -> Dict[str, Any]:
         if not path.exists():
             return {}
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-            if isinstance(data, dict):
+            data = self._read_json_cached(path)
+            if data is not None:
                 return data
         except Exception:
             return {}
@@ -61,9 +94,12 @@ class ConfigService:
 
     def _write_json_file(self, path: Path, payload: Dict[str, Any]) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
-        temp_path = path.with_suffix(path.suffix + ".tmp")
-        temp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-        temp_path.replace(path)
+        write_atomic(path, orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+        stamp = self._file_stamp(path)
+        if stamp is None:
+            self._json_cache.pop(path, None)
+        else:
+            self._json_cache[path] = (stamp, copy.deepcopy(payload))
 
     def _load_thumbnail_settings(self) -> ThumbnailCacheSettings:
         return ThumbnailCacheSettings.from_dict(self.load_config())
@@ -99,20 +135,50 @@ class ConfigService:
         self._write_json_file(self.config_path, config)
 
     def load_undesired_tags(self) -> List[str]:
+        return list(self._current_undesired())
+
+    @property
+    def undesired_tags(self) -> Tuple[str, ...]:
+        """Read-only view of the cached undesired tags; use load_undesired_tags() to edit."""
+        return self._current_undesired()
+
+    @property
+    def undesired_tags_lower(self) -> FrozenSet[str]:
+        """Lower-cased undesired tags, cached alongside undesired_tags."""
+        self._current_undesired()
+        return self._undesired_lower
+
+    def _current_undesired(self) -> Tuple[str, ...]:
+        cached = self._undesired_cache
+        if cached is not None and cached[0] == self._file_stamp(self.undesired_path):
+            return cached[1]
         data = self._load_json_file(self.undesired_path, self.DEFAULT_UNDESIRED)
         tags = data.get("tags", []) if isinstance(data, dict) else []
         if not isinstance(tags, list):
             self._write_json_file(self.undesired_path, self.DEFAULT_UNDESIRED)
-            return []
+            return self._remember_undesired([])
+        if self._is_canonical(tags):
+            return self._remember_undesired(tags)
         normalized = [self._normalize_tag(tag) for tag in tags if isinstance(tag, str) and tag.strip()]
-        if normalized != tags:
-            self._write_json_file(self.undesired_path, {"tags": normalized})
-        return normalized
+        self._write_json_file(self.undesired_path, {"tags": normalized})
+        return self._remember_undesired(normalized)
 
     def save_undesired_tags(self, tags: List[str]) -> None:
         normalized = [self._normalize_tag(tag) for tag in tags if isinstance(tag, str) and tag.strip()]
         payload = {"tags": normalized}
         self._write_json_file(self.undesired_path, payload)
+        self._remember_undesired(normalized)
+
+    def _remember_undesired(self, normalized: List[str]) -> Tuple[str, ...]:
+        tags = tuple(normalized)
+        stamp = self._file_stamp(self.undesired_path)
+        self._undesired_cache = (stamp, tags) if stamp is not None else None
+        self._undesired_lower = frozenset(tag.lower() for tag in tags)
+        return tags
+
+    @classmethod
+    def _is_canonical(cls, tags: List[object]) -> bool:
+        return all(isinstance(tag, str) and tag and cls._normalize_tag(tag) == tag for tag in tags)
 
     @staticmethod
     def _normalize_tag(tag: str) -> str:
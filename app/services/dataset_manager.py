@@ -1,21 +1,39 @@
 from __future__ import annotations
 
 import hashlib
-from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path, PurePath
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
 
 from fastapi import HTTPException, status
 
+from app.fileio import write_atomic
 from app.models import (
     ChangeEntry,
     ChangeSummary,
     DatasetSummary,
     FilterCriteria,
-    IMAGE_EXTENSIONS,
+    IMAGE_EXTENSIONS_TUPLE,
     ImageData,
 )
 from app.services.config_service import ConfigService
-from app.services.tag_service import TagService
+from app.services.tag_service import SharedHints, TagService
+
+
+@lru_cache(maxsize=4096)
+def _parse_tag_file(path: str, mtime_ns: int, size: int) -> Tuple[str, ...]:
+    # mtime_ns and size are part of the cache key so edited sidecars are re-read.
+    raw = Path(path).read_text(encoding="utf-8", errors="ignore")
+    return tuple(TagService.normalize_on_load(raw))
+
+
+_COMPLETE_HINTS: SharedHints = MappingProxyType(
+    {"missing_required": (), "possibly_missing": (), "not_required": (), "info": ()}
+)
 
 
 class DatasetManager:
@@ -25,14 +43,15 @@ class DatasetManager:
         self.dataset_rel: Optional[str] = None
         self.dataset_path: Optional[Path] = None
         self.images: Dict[str, ImageData] = {}
+        self._legacy_ids: Optional[Dict[str, str]] = None
+        self._image_order: List[str] = []
+        self._image_index: Dict[str, int] = {}
         self.refresh_dataset_root()
 
     def _error(self, status_code: int, code: str, message: str) -> HTTPException:
         return HTTPException(status_code=status_code, detail={"error": {"code": code, "message": message}})
 
     def _normalize_rel(self, rel: Optional[str]) -> str:
-        from pathlib import PurePath
-
         if rel in (None, ""):
             return ""
         pure = PurePath(rel)
@@ -51,6 +70,9 @@ class DatasetManager:
             self.dataset_rel = None
             self.dataset_path = None
             self.images = {}
+            self._legacy_ids = None
+            self._image_order = []
+            self._image_index = {}
 
     def _require_dataset_root(self) -> Path:
         if not self.dataset_root:
@@ -60,12 +82,16 @@ class DatasetManager:
     def _resolve_rel(self, rel: Optional[str]) -> Tuple[str, Path]:
         normalized = self._normalize_rel(rel)
         root = self._require_dataset_root()
-        target = (root / normalized).resolve()
-        try:
-            target.relative_to(root)
-        except ValueError:
+        if not normalized:
+            # dataset_root is resolved in refresh_dataset_root; nothing left to canonicalize.
+            return normalized, root
+        # _normalize_rel already rejects absolute paths and "..", so only a symlink
+        # inside the root can still point outside it; realpath catches that.
+        root_str = str(root)
+        real_target = os.path.realpath(os.path.join(root_str, normalized))
+        if os.path.commonpath((root_str, real_target)) != root_str:
             raise self._error(status.HTTP_403_FORBIDDEN, "FORBIDDEN", "Path escapes dataset root.")
-        return normalized, target
+        return normalized, Path(real_target)
 
     def browse(self, rel: Optional[str]) -> Dict[str, object]:
         self.refresh_dataset_root()
@@ -75,10 +101,11 @@ class DatasetManager:
         if not target.is_dir():
             raise self._error(status.HTTP_400_BAD_REQUEST, "INVALID_PATH", "Target is not a directory.")
 
-        dirs = []
-        for child in sorted(target.iterdir(), key=lambda p: p.name.lower()):
-            if child.is_dir():
-                dirs.append({"name": child.name})
+        # Filter to directories before sorting; DirEntry.is_dir() answers from the
+        # readdir type info. Symlinked directories are skipped, matching the image walk.
+        with os.scandir(target) as entries:
+            dirs = [{"name": entry.name} for entry in entries if entry.is_dir(follow_symlinks=False)]
+        dirs.sort(key=lambda item: item["name"].lower())
 
         parent_path = Path(normalized).parent.as_posix() if normalized else ""
         parent_rel = "" if parent_path in ("", ".") else parent_path
@@ -90,11 +117,34 @@ class DatasetManager:
         }
 
     def _count_images_recursive(self, target: Path) -> int:
-        count = 0
-        for path in target.rglob("*"):
-            if path.is_file() and path.suffix.lower() in IMAGE_EXTENSIONS:
-                count += 1
-        return count
+        return sum(1 for _ in self._iter_image_entries(target))
+
+    @staticmethod
+    def _iter_image_entries(root: Path) -> Iterator[os.DirEntry]:
+        # Single scandir walk: DirEntry caches the file type from readdir, so unlike
+        # rglob + is_file() this avoids a stat per entry. Like rglob, symlinked
+        # directories are not descended into and unreadable directories are skipped.
+        # Symlinked image files are kept only if they resolve inside root.
+        root_str = os.fspath(root)
+        stack = [root_str]
+        while stack:
+            try:
+                scandir_it = os.scandir(stack.pop())
+            except PermissionError:
+                continue
+            with scandir_it:
+                for entry in scandir_it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.lower().endswith(IMAGE_EXTENSIONS_TUPLE) and entry.is_file():
+                            if entry.is_symlink():
+                                real_path = os.path.realpath(entry.path)
+                                if os.path.commonpath((root_str, real_path)) != root_str:
+                                    continue
+                            yield entry
+                    except OSError:
+                        continue
 
     def load_dataset(self, rel: str) -> Dict[str, object]:
         self.refresh_dataset_root()
@@ -105,7 +155,7 @@ class DatasetManager:
             raise self._error(status.HTTP_400_BAD_REQUEST, "INVALID_PATH", "Target is not a directory.")
 
         image_files = sorted(
-            [p for p in target.rglob("*") if p.is_file() and p.suffix.lower() in IMAGE_EXTENSIONS],
+            (Path(entry.path) for entry in self._iter_image_entries(target)),
             key=lambda p: p.as_posix().lower(),
         )
         if not image_files:
@@ -116,20 +166,26 @@ class DatasetManager:
         self.dataset_rel = normalized
         self.dataset_path = target
         self.images = {}
-        for img_path in image_files:
+        self._legacy_ids = None
+        # Tag files are tiny and reading them is dominated by I/O latency, so
+        # fetch them concurrently; results come back in image_files order.
+        with ThreadPoolExecutor(max_workers=min(32, len(image_files))) as executor:
+            loaded_tags = list(executor.map(self._load_tags, image_files))
+        for img_path, tags in zip(image_files, loaded_tags):
             rel_path = img_path.relative_to(target).as_posix()
-            image_id = hashlib.sha1(rel_path.encode("utf-8")).hexdigest()
-            tags_raw = self._read_tags(img_path)
-            tags = TagService.normalize_on_load(tags_raw)
+            image_id = self._image_id_for(rel_path)
             self.images[image_id] = ImageData(
                 image_id=image_id,
                 rel_path=rel_path,
                 abs_path=img_path,
-                tags_original=tags,
+                tags_original=list(tags),
                 tags_current=list(tags),
                 is_complete=False,
             )
 
+        self._image_order = list(self.images)
+        self._image_index = {image_id: position for position, image_id in enumerate(self._image_order)}
+
         unique_tags = set()
         for image in self.images.values():
             unique_tags.update(image.tags_current)
@@ -140,39 +196,42 @@ class DatasetManager:
             "warnings": [],
         }
 
-    def _read_tags(self, image_path: Path) -> str:
-        tag_path = image_path.with_suffix(".txt")
-        if not tag_path.exists():
-            return ""
-        return tag_path.read_text(encoding="utf-8", errors="ignore")
-
-    def get_dataset_summary(self, filters: Optional[FilterCriteria] = None) -> DatasetSummary:
+    def _load_tags(self, image_path: Path) -> Tuple[str, ...]:
+        tag_path = os.fspath(image_path.with_suffix(".txt"))
+        try:
+            stat = os.stat(tag_path)
+            return _parse_tag_file(tag_path, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            return ()
+
+    def get_dataset_summary(
+        self, filters: Optional[FilterCriteria] = None, *, include_hints: bool = True
+    ) -> DatasetSummary:
         if not self.dataset_path or self.dataset_rel is None:
             raise self._error(status.HTTP_404_NOT_FOUND, "NO_DATASET", "No dataset loaded.")
         criteria = filters or FilterCriteria()
-        undesired_tags = set(tag.lower() for tag in self.config_service.load_undesired_tags())
+        undesired_tags = self.config_service.undesired_tags_lower
         images_payload = []
-        tag_counts: Dict[str, int] = {}
-
-        for image in self._filtered_images(criteria):
-            for tag in image.tags_current:
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
-            hints = self._image_hints(image)
-            images_payload.append(
-                {
-                    "image_id": image.image_id,
-                    "filename": Path(image.rel_path).name,
-                    "rel_path": image.rel_path,
-                    "tag_count": len(image.tags_current),
-                    "has_undesired": bool(undesired_tags.intersection(set(t.lower() for t in image.tags_current))),
-                    "is_complete": image.is_complete,
-                    "hints": hints,
-                }
-            )
+        tag_counts: Counter[str] = Counter()
+
+        for image, hints in self._filter_with_hints(criteria, undesired_tags):
+            tag_counts.update(image.tags_current)
+            entry = {
+                "image_id": image.image_id,
+                "filename": Path(image.rel_path).name,
+                "rel_path": image.rel_path,
+                "tag_count": len(image.tags_current),
+                "has_undesired": not undesired_tags.isdisjoint(image.tags_current_lower),
+                "is_complete": image.is_complete,
+            }
+            if include_hints:
+                # Shallow copy: the shared mapping proxy is read-only but not JSON-serializable.
+                entry["hints"] = dict(hints if hints is not None else self._image_hints(image))
+            images_payload.append(entry)
 
         tags_payload = [
             {"tag": tag, "count": count, "is_undesired": tag.lower() in undesired_tags}
-            for tag, count in sorted(tag_counts.items(), key=lambda item: item[0])
+            for tag, count in sorted(tag_counts.items())
         ]
 
         return DatasetSummary(
@@ -182,57 +241,90 @@ class DatasetManager:
             images=images_payload,
         )
 
-    def _filtered_images(self, criteria: FilterCriteria) -> Iterable[ImageData]:
-        undesired_set = set(tag.lower() for tag in self.config_service.load_undesired_tags())
+    def _filtered_images(
+        self, criteria: FilterCriteria, undesired_set: Optional[FrozenSet[str]] = None
+    ) -> Iterable[ImageData]:
+        for image, _hints in self._filter_with_hints(criteria, undesired_set):
+            yield image
+
+    def _filter_with_hints(
+        self, criteria: FilterCriteria, undesired_set: Optional[FrozenSet[str]] = None
+    ) -> Iterator[Tuple[ImageData, Optional[SharedHints]]]:
+        """Yield matching images with their hints when the filter had to compute them, else None."""
+        if criteria.is_empty():
+            for image in self.images.values():
+                yield image, None
+            return
+        needle = criteria.filename_contains.lower() if criteria.filename_contains else None
+        if undesired_set is None and criteria.has_undesired is not None:
+            undesired_set = self.config_service.undesired_tags_lower
         for image in self.images.values():
-            if criteria.filename_contains:
-                if criteria.filename_contains.lower() not in image.rel_path.lower():
-                    continue
+            if needle is not None and needle not in image.rel_path.lower():
+                continue
             if criteria.has_tag:
-                if criteria.has_tag not in image.tags_current:
+                if criteria.has_tag not in image.current_set:
                     continue
             if criteria.is_complete is not None:
                 if bool(image.is_complete) != bool(criteria.is_complete):
                     continue
             if criteria.has_undesired is not None:
-                has_flag = bool(undesired_set.intersection({t.lower() for t in image.tags_current}))
+                has_flag = not undesired_set.isdisjoint(image.tags_current_lower)
                 if has_flag != bool(criteria.has_undesired):
                     continue
+            hints = None
             if criteria.has_missing_required is not None:
-                if image.is_complete:
-                    missing = False
-                else:
-                    hints = TagService.compute_hints(image.tags_current)
-                    missing = bool(hints.get("missing_required"))
-                if missing != bool(criteria.has_missing_required):
+                hints = self._image_hints(image)
+                if bool(hints.get("missing_required")) != bool(criteria.has_missing_required):
                     continue
-            yield image
+            yield image, hints
 
-    def get_image_tags(self, image_id: str) -> Dict[str, object]:
+    @staticmethod
+    def _image_id_for(rel_path: str) -> str:
+        return hashlib.blake2b(rel_path.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _lookup_image(self, image_id: str) -> Optional[ImageData]:
         image = self.images.get(image_id)
+        if image is None and len(image_id) == 40:
+            # Image ids used to be SHA-1 hex digests of rel_path; keep those links
+            # resolving for one release. Remove together with _legacy_ids.
+            if self._legacy_ids is None:
+                self._legacy_ids = {
+                    hashlib.sha1(item.rel_path.encode("utf-8")).hexdigest(): item.image_id
+                    for item in self.images.values()
+                }
+            canonical = self._legacy_ids.get(image_id)
+            image = self.images.get(canonical) if canonical else None
+        return image
+
+    def get_image_tags(self, image_id: str) -> Dict[str, object]:
+        image = self._lookup_image(image_id)
         if not image:
             raise self._error(status.HTTP_404_NOT_FOUND, "NOT_FOUND", "Image not found.")
-        return {"image_id": image_id, "tags": image.tags_current, "is_dirty": image.is_dirty()}
+        return {"image_id": image.image_id, "tags": image.tags_current, "is_dirty": image.is_dirty()}
 
     def get_neighbor_ids(self, image_id: str) -> Dict[str, Optional[str]]:
         if image_id not in self.images:
             raise self._error(status.HTTP_404_NOT_FOUND, "NOT_FOUND", "Image not found.")
-        image_ids = list(self.images.keys())
-        index = image_ids.index(image_id)
+        if len(self._image_index) != len(self.images) or image_id not in self._image_index:
+            # images was replaced without going through load_dataset; rebuild the order.
+            self._image_order = list(self.images)
+            self._image_index = {iid: position for position, iid in enumerate(self._image_order)}
+        image_ids = self._image_order
+        index = self._image_index[image_id]
         previous_id = image_ids[index - 1] if index > 0 else None
         next_id = image_ids[index + 1] if index < len(image_ids) - 1 else None
         return {"previous": previous_id, "next": next_id}
 
     def stage_image_edit(self, image_id: str, op: Dict[str, object]) -> Dict[str, object]:
-        image = self.images.get(image_id)
+        image = self._lookup_image(image_id)
         if not image:
             raise self._error(status.HTTP_404_NOT_FOUND, "NOT_FOUND", "Image not found.")
 
         op_type = op.get("type")
         if op_type == "add":
             tag = (op.get("tag") or "").strip()
-            if tag and tag not in image.tags_current:
-                image.tags_current.append(tag)
+            if tag and tag not in image.current_set:
+                image.tags_current = [*image.tags_current, tag]
         elif op_type == "delete":
             tag = (op.get("tag") or "").strip()
             image.tags_current = [t for t in image.tags_current if t != tag]
@@ -277,9 +369,13 @@ class DatasetManager:
             image.tags_current = updated_tags
         elif op_type == "add_many":
             tags = self._coerce_tag_list(op.get("tags"))
+            updated = list(image.tags_current)
+            present = set(updated)
             for tag in tags:
-                if tag not in image.tags_current:
-                    image.tags_current.append(tag)
+                if tag not in present:
+                    updated.append(tag)
+                    present.add(tag)
+            image.tags_current = updated
         elif op_type == "remove_many":
             tags = set(self._coerce_tag_list(op.get("tags")))
             if tags:
@@ -290,7 +386,7 @@ class DatasetManager:
         else:
             raise self._error(status.HTTP_400_BAD_REQUEST, "INVALID_OP", "Unsupported operation.")
 
-        return {"image_id": image_id, "is_dirty": image.is_dirty()}
+        return {"image_id": image.image_id, "is_dirty": image.is_dirty()}
 
     def _coerce_tag_list(self, raw: object) -> List[str]:
         if raw is None:
@@ -306,17 +402,23 @@ class DatasetManager:
     def _tags_match(self, proposed: List[str], current: List[str]) -> bool:
         if len(proposed) != len(current):
             return False
-        from collections import Counter
-
-        return Counter(proposed) == Counter(current)
+        # Single-pass multiset diff: count proposed tags down against the current
+        # ones and bail out on the first tag that is over-represented.
+        remaining: Dict[str, int] = {}
+        for tag in current:
+            remaining[tag] = remaining.get(tag, 0) + 1
+        for tag in proposed:
+            count = remaining.get(tag, 0)
+            if not count:
+                return False
+            remaining[tag] = count - 1
+        return True
 
     def analyze_image(self, image_id: str) -> Dict[str, object]:
-        image = self.images.get(image_id)
+        image = self._lookup_image(image_id)
         if not image:
             raise self._error(status.HTTP_404_NOT_FOUND, "NOT_FOUND", "Image not found.")
 
-        from collections import Counter
-
         cleaned = [str(tag).strip() for tag in image.tags_current if str(tag).strip()]
         unique: List[str] = []
         seen = set()
@@ -336,7 +438,7 @@ class DatasetManager:
         proposed_line = TagService.normalize_on_save(unique)
 
         return {
-            "image_id": image_id,
+            "image_id": image.image_id,
             "current_tags": image.tags_current,
             "proposed_tags": unique,
             "proposed_line": proposed_line,
@@ -362,8 +464,8 @@ class DatasetManager:
             op_type = op.get("type")
             if op_type == "add":
                 tag = (op.get("tag") or "").strip()
-                if tag and tag not in image.tags_current:
-                    image.tags_current.append(tag)
+                if tag and tag not in image.current_set:
+                    image.tags_current = [*image.tags_current, tag]
                     summary["added"] += 1
             elif op_type == "delete":
                 tag = (op.get("tag") or "").strip()
@@ -376,7 +478,7 @@ class DatasetManager:
                 new_tag = (op.get("new_tag") or "").strip()
                 if not old_tag or not new_tag:
                     continue
-                if old_tag in image.tags_current:
+                if old_tag in image.current_set:
                     image.tags_current = [new_tag if t == old_tag else t for t in image.tags_current]
                     summary["replaced"] += 1
             else:
@@ -413,16 +515,20 @@ class DatasetManager:
     def apply_changes(self) -> Dict[str, object]:
         if not self.dataset_path:
             raise self._error(status.HTTP_404_NOT_FOUND, "NO_DATASET", "No dataset loaded.")
+        dirty = [image for image in self.images.values() if image.is_dirty()]
+        if not dirty:
+            return {"applied": True, "written_files": 0}
+        tag_paths = [image.abs_path.with_suffix(".txt") for image in dirty]
+        contents = [TagService.normalize_on_save(image.tags_current).encode("utf-8") for image in dirty]
+        for parent in {tag_path.parent for tag_path in tag_paths}:
+            parent.mkdir(parents=True, exist_ok=True)
+
         written = 0
-        for image in self.images.values():
-            if not image.is_dirty():
-                continue
-            tag_path = image.abs_path.with_suffix(".txt")
-            content = TagService.normalize_on_save(image.tags_current)
-            tag_path.parent.mkdir(parents=True, exist_ok=True)
-            tag_path.write_text(content, encoding="utf-8")
-            image.tags_original = list(image.tags_current)
-            written += 1
+        with ThreadPoolExecutor(max_workers=min(8, len(dirty))) as executor:
+            # Results arrive in order, so an image is only marked clean once its own write succeeded.
+            for image, _ in zip(dirty, executor.map(write_atomic, tag_paths, contents)):
+                image.tags_original = list(image.tags_current)
+                written += 1
         return {"applied": True, "written_files": written}
 
     def discard_changes(self) -> Dict[str, object]:
@@ -431,26 +537,32 @@ class DatasetManager:
         return {"discarded": True}
 
     def get_image(self, image_id: str) -> ImageData:
-        image = self.images.get(image_id)
+        image = self._lookup_image(image_id)
         if not image:
             raise self._error(status.HTTP_404_NOT_FOUND, "NOT_FOUND", "Image not found.")
         return image
 
     def set_image_complete(self, image_id: str, complete: bool) -> Dict[str, object]:
-        image = self.images.get(image_id)
+        image = self._lookup_image(image_id)
         if not image:
             raise self._error(status.HTTP_404_NOT_FOUND, "NOT_FOUND", "Image not found.")
         image.is_complete = bool(complete)
-        return {"image_id": image_id, "is_complete": image.is_complete}
+        return {"image_id": image.image_id, "is_complete": image.is_complete}
 
     def require_loaded(self) -> None:
         if not self.dataset_path:
             raise self._error(status.HTTP_404_NOT_FOUND, "NO_DATASET", "No dataset loaded.")
 
+    def get_loaded_image(self, image_id: str) -> ImageData:
+        if not self.dataset_path:
+            raise self._error(status.HTTP_404_NOT_FOUND, "NO_DATASET", "No dataset loaded.")
+        image = self._lookup_image(image_id)
+        if not image:
+            raise self._error(status.HTTP_404_NOT_FOUND, "NOT_FOUND", "Image not found.")
+        return image
+
     def get_image_absolute_path(self, image_id: str) -> Path:
-        self.require_loaded()
-        image = self.get_image(image_id)
-        return image.abs_path
+        return self.get_loaded_image(image_id).abs_path
 
     def get_dataset_root(self) -> Optional[Path]:
         return self.dataset_root
@@ -458,7 +570,7 @@ class DatasetManager:
     def get_dataset_rel(self) -> Optional[str]:
         return self.dataset_rel
 
-    def _image_hints(self, image: ImageData) -> Dict[str, List[str]]:
+    def _image_hints(self, image: ImageData) -> SharedHints:
         if image.is_complete:
-            return {"missing_required": [], "possibly_missing": [], "not_required": [], "info": []}
-        return TagService.compute_hints(image.tags_current)
+            return _COMPLETE_HINTS
+        return TagService.shared_hints(image.tags_current)
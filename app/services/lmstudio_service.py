@@ -2,14 +2,26 @@ from __future__ import annotations
 
 import asyncio
 import base64
-import json
 import os
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Sequence, Set
 from urllib import error as url_error
 from urllib import request as url_request
 
+import orjson
+
+# Deletes every character TOKEN_PATTERN accepts; anything left over makes a token invalid.
+_STRIP_TOKEN_CHARS = str.maketrans(dict.fromkeys("abcdefghijklmnopqrstuvwxyz0123456789_- "))
+
+
+@lru_cache(maxsize=8)
+def _image_data_url(path: str, mtime_ns: int) -> str:
+    # mtime_ns is part of the cache key so edited images are re-read. The prefix is
+    # joined at the bytes level and decoded once as ASCII (base64 is pure ASCII).
+    return (b"data:image/jpeg;base64," + base64.b64encode(Path(path).read_bytes())).decode("ascii")
+
 
 class LmStudioError(Exception):
     """Base error for LM Studio interactions."""
@@ -48,7 +60,7 @@ class LmStudioService:
         return self.parse_first_line_tags(text_output, exclusions=exclusions)
 
     def _send_payload(self, payload: dict) -> dict:
-        data = json.dumps(payload).encode("utf-8")
+        data = orjson.dumps(payload)
         request = url_request.Request(
             self.endpoint, data=data, headers={"Content-Type": "application/json"}
         )
@@ -63,13 +75,12 @@ class LmStudioService:
             raise LmStudioTimeoutError("LM Studio request timed out") from exc
 
         try:
-            return json.loads(body.decode("utf-8"))
-        except ValueError as exc:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError as exc:
             raise LmStudioInvalidResponseError("LM Studio returned non-JSON response") from exc
 
     def _build_payload(self, image_path: Path, current_tags: Sequence[str]) -> dict:
-        image_bytes = image_path.read_bytes()
-        encoded_image = base64.b64encode(image_bytes).decode("utf-8")
+        image_url = _image_data_url(str(image_path), image_path.stat().st_mtime_ns)
         current_tag_line = ", ".join([tag.strip() for tag in current_tags if tag.strip()])
         messages = [
             {
@@ -82,7 +93,7 @@ class LmStudioService:
                     {"type": "text", "text": f"CURRENT_TAGS: {current_tag_line}"},
                     {
                         "type": "image_url",
-                        "image_url": {"url": f"data:image/jpeg;base64,{encoded_image}"},
+                        "image_url": {"url": image_url},
                     },
                 ],
             },
@@ -124,7 +135,7 @@ class LmStudioService:
                 continue
             if cleaned in seen:
                 continue
-            if not cls.TOKEN_PATTERN.match(cleaned):
+            if cleaned.translate(_STRIP_TOKEN_CHARS):
                 raise LmStudioInvalidResponseError(f"Invalid token: {cleaned}")
             seen.add(cleaned)
             tags.append(cleaned)
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
 
-from app.services.tagging_rules import TaggingRulesEngine, _dedupe_preserve
+from app.services.tagging_rules import TaggingRulesEngine
+
+SignalsKey = Optional[Tuple[Tuple[str, Optional[bool]], ...]]
+SharedHints = Mapping[str, Tuple[str, ...]]
 
 
 class TagService:
@@ -27,14 +32,28 @@ class TagService:
         return ", ".join(cleaned)
 
     @staticmethod
-    def compute_hints(tags: List[str], external_signals: Optional[Dict[str, Optional[bool]]] = None) -> Dict[str, List[str]]:
+    def compute_hints(
+        tags: Sequence[str],
+        external_signals: Optional[Dict[str, Optional[bool]]] = None,
+    ) -> Dict[str, List[str]]:
+        hints = TagService.shared_hints(tags, external_signals)
+        return {key: list(values) for key, values in hints.items()}
+
+    @staticmethod
+    def shared_hints(
+        tags: Sequence[str],
+        external_signals: Optional[Dict[str, Optional[bool]]] = None,
+    ) -> SharedHints:
+        """Cached hints as an immutable mapping of tuples, shared between callers."""
+        signals_key = tuple(sorted(external_signals.items())) if external_signals else None
+        return TagService._cached_hints(tuple(tags), signals_key)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _cached_hints(tags: Tuple[str, ...], signals_key: SignalsKey) -> SharedHints:
         engine = TagService._get_engine()
-        hints = engine.evaluate(tags, external_signals)
-        for key in ("missing_required", "possibly_missing", "not_required"):
-            hints[key] = _dedupe_preserve(hints.get(key, []))
-        if "info" in hints:
-            hints["info"] = _dedupe_preserve(hints.get("info", []))
-        return hints
+        hints = engine.evaluate(list(tags), dict(signals_key) if signals_key else None)
+        return MappingProxyType({key: tuple(values) for key, values in hints.items()})
 
     @staticmethod
     def categorize_tags(tags: List[str]) -> Dict[str, List[str]]:
@@ -43,5 +62,11 @@ class TagService:
 
     @staticmethod
     def hint_options(category_id: str) -> Dict[str, object]:
+        options = TagService._cached_hint_options(category_id)
+        return {**options, "options": list(options["options"])}
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _cached_hint_options(category_id: str) -> Dict[str, object]:
         engine = TagService._get_engine()
         return engine.hint_options(category_id)
@@ -1,37 +1,89 @@
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Set
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import orjson
+
+from app import PACKAGE_DIR
+
+
+# Hint bucket names, shared by _build_hints and _route_condition.
+_MISSING_REQUIRED = "missing_required"
+_POSSIBLY_MISSING = "possibly_missing"
+_NOT_REQUIRED = "not_required"
+_SEVERITY_BUCKETS: Dict[str, str] = {
+    "error": _MISSING_REQUIRED,
+    "warning": _POSSIBLY_MISSING,
+    "ignore": _NOT_REQUIRED,
+    "info": _POSSIBLY_MISSING,
+}
+
+# A derived signal, compiled at load into a predicate over the canonical tag set.
+Derivation = Callable[[Set[str]], Optional[bool]]
+
+# A constraint's "when" clause, precompiled to (signal id, expected value).
+Condition = Tuple[Optional[str], object]
+
+# Substrings that place an unknown tag in a freeform-allowed category.
+_FREEFORM_SUBSTRINGS: Dict[str, Tuple[str, ...]] = {
+    "arm_hand_position": ("arm", "hand"),
+}
+
+
+# Canonical tags seen in loaded specs. Canonicalization is idempotent, so these can be
+# returned as-is without touching the memoized string work.
+_KNOWN_CANONICALS: Set[str] = set()
 
 
 def _canonicalize_tag(tag: str) -> str:
-    cleaned = " ".join(str(tag).strip().lower().replace("-", " ").split())
-    return cleaned
+    if type(tag) is str:
+        if tag in _KNOWN_CANONICALS:
+            return tag
+        return _canonicalize_str(tag)
+    return _canonicalize_str(str(tag))
 
 
-@dataclass
+@lru_cache(maxsize=8192)
+def _canonicalize_str(tag: str) -> str:
+    # Real datasets repeat the same few hundred tags, so memoize the string work.
+    return " ".join(tag.strip().lower().replace("-", " ").split())
+
+
+@dataclass(slots=True, frozen=True)
 class CategoryDefinition:
     id: str
     tier: str
     cardinality_min: int
     cardinality_max: int
     applicability: str
-    allowed_values: Set[str]
-    preferred_values: Set[str]
-    allowed_values_raw: List[str]
-    preferred_values_raw: List[str]
+    allowed_values: FrozenSet[str]
+    preferred_values: FrozenSet[str]
+    allowed_values_raw: Tuple[str, ...]
+    preferred_values_raw: Tuple[str, ...]
     allows_freeform: bool
+    combined: FrozenSet[str] = field(init=False, repr=False)
+    hint_option_values: Tuple[str, ...] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "combined", self.allowed_values | self.preferred_values)
+        object.__setattr__(
+            self,
+            "hint_option_values",
+            tuple(dict.fromkeys((*self.preferred_values_raw, *self.allowed_values_raw))),
+        )
 
     def matches(self, tag: str) -> bool:
-        canonical = _canonicalize_tag(tag)
-        return canonical in self.allowed_values or canonical in self.preferred_values
+        return _canonicalize_tag(tag) in self.combined
 
 
 class TaggingPolicy:
     def __init__(self, policy_path: Path, taxonomy_version: str, graph_version: str):
-        self.policy = json.loads(policy_path.read_text(encoding="utf-8"))
+        self.policy = orjson.loads(policy_path.read_bytes())
         self.policy_version: str = str(self.policy.get("policy_version"))
         self.taxonomy_version = str(self.policy.get("taxonomy_version"))
         self.graph_version = str(self.policy.get("graph_version"))
@@ -42,6 +94,7 @@ class TaggingPolicy:
         self.defaults: Dict[str, str] = self.policy.get("defaults", {})
         self.category_policy: Dict[str, Dict[str, object]] = self.policy.get("category_policy", {})
         self.tag_policy: Dict[str, Dict[str, object]] = self.policy.get("tag_policy", {})
+        self._missing_severity_cache: Dict[Tuple[object, ...], Optional[str]] = {}
 
     def has_category_missing_rule(self, category_id: str) -> bool:
         return "missing" in self.category_policy.get(category_id, {})
@@ -81,6 +134,29 @@ class TaggingPolicy:
         relaxed_missing = category_policy.get("relaxed_missing") if relaxed else None
         return relaxed_missing or severity
 
+    def cached_missing_severity(
+        self,
+        category_id: str,
+        signals_key: Tuple[Tuple[str, Optional[bool]], ...],
+        *,
+        signals: Dict[str, Optional[bool]],
+        relaxed: bool,
+        required: bool,
+        triggered: bool,
+    ) -> Optional[str]:
+        """missing_severity memoized by category and signal state; signals_key must describe signals."""
+        key = (category_id, signals_key, relaxed, required, triggered)
+        try:
+            return self._missing_severity_cache[key]
+        except KeyError:
+            pass
+        severity = self.missing_severity(
+            category_id, signals=signals, relaxed=relaxed, required=required, triggered=triggered
+        )
+        # Bounded by categories x signal combinations x three flags, so no eviction needed.
+        self._missing_severity_cache[key] = severity
+        return severity
+
     def severity_for_condition(self, condition_type: str) -> str:
         return self.defaults.get(condition_type, "error")
 
@@ -101,17 +177,23 @@ class TaggingSpec:
     """
 
     def __init__(self, taxonomy_path: Path, applicability_path: Path, policy_path: Path):
-        self.taxonomy = json.loads(taxonomy_path.read_text(encoding="utf-8"))
-        self.graph = json.loads(applicability_path.read_text(encoding="utf-8"))
+        self.taxonomy = orjson.loads(taxonomy_path.read_bytes())
+        self.graph = orjson.loads(applicability_path.read_bytes())
         self.categories: Dict[str, CategoryDefinition] = {}
         self.tag_lookup: Dict[str, str] = {}
-        self.singleton_categories: Set[str] = set()
-        self.relaxations = []
-        self.require_constraints = []
-        self.forbidden_constraints = []
-        self.derived_signals = {}
+        self.singleton_categories: FrozenSet[str] = frozenset()
+        self.effective_singletons: FrozenSet[str] = frozenset()
+        self.relaxations: List[Tuple[Condition, List[Dict[str, object]]]] = []
+        self.require_constraints: List[Tuple[Condition, List[Dict[str, object]]]] = []
+        self.forbidden_constraints: List[Tuple[Condition, Tuple[str, ...], FrozenSet[str]]] = []
+        self.derived_signals: Dict[str, Derivation] = {}
         self.external_signals = set()
         self.tier3_allowed: Set[str] = set()
+        self._freeform_substring_rules: List[Tuple[Tuple[str, ...], str]] = []
+        # Every tag the taxonomy knows, mapped to its category (None for tier-3 tags that
+        # stay uncategorized), so categorize_tags resolves known tags with one dict lookup.
+        self.resolution: Dict[str, Optional[str]] = {}
+        self.category_rank: Dict[str, int] = {}
         self._load_categories()
         self._load_constraints()
         self.policy = TaggingPolicy(
@@ -122,25 +204,30 @@ class TaggingSpec:
 
     def _load_categories(self) -> None:
         for category in self.taxonomy.get("categories", []):
-            allowed_values = {_canonicalize_tag(v) for v in category.get("allowed_values", [])}
-            preferred_values = {_canonicalize_tag(v) for v in category.get("preferred_values", [])}
+            allowed_values = frozenset(_canonicalize_tag(v) for v in category.get("allowed_values", []))
+            preferred_values = frozenset(_canonicalize_tag(v) for v in category.get("preferred_values", []))
             freeform_policy = category.get("freeform_policy") or {}
             allows_freeform = bool(freeform_policy.get("allowed", False))
             definition = CategoryDefinition(
-                id=category["id"],
+                # One interned id object backs every category-keyed dict built from the spec.
+                id=sys.intern(category["id"]),
                 tier=category["tier"],
                 cardinality_min=int(category.get("cardinality", {}).get("min", 0)),
                 cardinality_max=int(category.get("cardinality", {}).get("max", 1)),
                 applicability=str(category.get("applicability", {}).get("when", "generally_applicable")),
                 allowed_values=allowed_values,
                 preferred_values=preferred_values,
-                allowed_values_raw=list(category.get("allowed_values", [])),
-                preferred_values_raw=list(category.get("preferred_values", [])),
+                allowed_values_raw=tuple(category.get("allowed_values", [])),
+                preferred_values_raw=tuple(category.get("preferred_values", [])),
                 allows_freeform=allows_freeform,
             )
             self.categories[definition.id] = definition
-            for value in allowed_values.union(preferred_values):
+            self.category_rank[definition.id] = len(self.category_rank)
+            for value in definition.combined:
                 self.tag_lookup[value] = definition.id
+            substrings = _FREEFORM_SUBSTRINGS.get(definition.id)
+            if allows_freeform and substrings:
+                self._freeform_substring_rules.append((substrings, definition.id))
 
         tier3 = self.taxonomy.get("tier_3_allowed_tags", {})
         for info in tier3.values():
@@ -149,160 +236,219 @@ class TaggingSpec:
                     self.tier3_allowed.add(_canonicalize_tag(value))
             for example in info.get("examples", []):
                 self.tier3_allowed.add(_canonicalize_tag(example))
+        for value in self.tier3_allowed:
+            self.resolution[value] = self._soft_category_for_freeform(value)
+        self.resolution.update(self.tag_lookup)
+        _KNOWN_CANONICALS.update(self.resolution)
 
+        singleton_categories: Set[str] = set()
         for check in self.graph.get("consistency_checks", []):
             if check.get("rule") == "no_more_than_one_value_each":
-                for category in check.get("categories", []):
-                    self.singleton_categories.add(category)
+                singleton_categories.update(check.get("categories", []))
+        self.singleton_categories = frozenset(singleton_categories)
+        # Categories limited to one value, whether by a consistency check or by cardinality.
+        self.effective_singletons = self.singleton_categories | {
+            cid for cid, definition in self.categories.items() if definition.cardinality_max == 1
+        }
 
         for signal_id, definition in (self.graph.get("signals") or {}).items():
             if definition.get("type") == "derived":
-                self.derived_signals[signal_id] = definition.get("derivation") or {}
+                self.derived_signals[signal_id] = self._compile_derivation(definition.get("derivation") or {})
             if definition.get("type") == "external":
                 self.external_signals.add(signal_id)
 
     def _load_constraints(self) -> None:
         for constraint in self.graph.get("constraints", []):
             when = constraint.get("when") or {}
+            condition: Condition = (when.get("signal"), when.get("equals"))
             require = constraint.get("require") or []
             forbid_tags = constraint.get("forbid_tags") or []
             relax = constraint.get("relax") or []
             if require:
-                self.require_constraints.append((when, require))
+                self.require_constraints.append((condition, require))
             if forbid_tags:
-                canonical_forbidden = [_canonicalize_tag(tag) for tag in forbid_tags]
-                self.forbidden_constraints.append((when, canonical_forbidden))
+                # Keep the ordered tuple for stable hint output and a frozenset for the overlap test.
+                canonical_forbidden = tuple(dict.fromkeys(_canonicalize_tag(tag) for tag in forbid_tags))
+                self.forbidden_constraints.append((condition, canonical_forbidden, frozenset(canonical_forbidden)))
             if relax:
-                self.relaxations.append((when, relax))
+                self.relaxations.append((condition, relax))
+        # Conditions each constraint kind is gated on, so evaluation can skip a whole
+        # loop when none of them currently holds.
+        self.require_conditions: FrozenSet[Condition] = frozenset(c for c, _ in self.require_constraints)
+        self.forbidden_conditions: FrozenSet[Condition] = frozenset(c for c, _, _ in self.forbidden_constraints)
+        self.relax_conditions: FrozenSet[Condition] = frozenset(c for c, _ in self.relaxations)
+
+    @staticmethod
+    def active_conditions(signals: Dict[str, Optional[bool]]) -> Set[Condition]:
+        return {(signal, value) for signal, value in signals.items() if value is not None}
 
     def categorize_tags(self, tags: Iterable[str]) -> Dict[str, List[str]]:
-        categorized: Dict[str, List[str]] = {cid: [] for cid in self.categories}
-        for tag in tags:
-            canonical = _canonicalize_tag(tag)
-            category_id = self.tag_lookup.get(canonical)
+        return self.categorize_tags_canonical(_canonicalize_tag(tag) for tag in tags)
+
+    def categorize_tags_canonical(self, canonical_tags: Iterable[str]) -> Dict[str, List[str]]:
+        """categorize_tags for input that has already been through _canonicalize_tag."""
+        categorized: Dict[str, List[str]] = defaultdict(list)
+        resolution = self.resolution
+        for canonical in canonical_tags:
+            if canonical in resolution:
+                category_id = resolution[canonical]
+            else:
+                category_id = self._soft_category_for_freeform(canonical)
             if category_id:
                 categorized[category_id].append(canonical)
-                continue
-            soft_category = self._soft_category_for_freeform(canonical)
-            if soft_category:
-                categorized[soft_category].append(canonical)
-                continue
-            if canonical in self.tier3_allowed:
-                continue
-        return {cid: values for cid, values in categorized.items() if values}
+        return dict(categorized)
+
+    def count_categories_canonical(self, canonical_tags: Iterable[str]) -> Dict[str, int]:
+        """Like categorize_tags_canonical, but only the number of tags per category."""
+        counts: Dict[str, int] = {}
+        resolution = self.resolution
+        for canonical in canonical_tags:
+            if canonical in resolution:
+                category_id = resolution[canonical]
+            else:
+                category_id = self._soft_category_for_freeform(canonical)
+            if category_id:
+                counts[category_id] = counts.get(category_id, 0) + 1
+        return counts
 
     def evaluate_signals(self, tags: Set[str], external_signals: Dict[str, Optional[bool]]) -> Dict[str, Optional[bool]]:
         signals: Dict[str, Optional[bool]] = {}
         for signal_id in self.external_signals:
             signals[signal_id] = external_signals.get(signal_id)
         for signal_id, derivation in self.derived_signals.items():
-            signals[signal_id] = self._eval_derivation(derivation, tags)
+            signals[signal_id] = derivation(tags)
         return signals
 
     def relaxed_categories(self, signals: Dict[str, Optional[bool]]) -> Set[str]:
         relaxed: Set[str] = set()
-        for when, relax in self.relaxations:
-            if self._condition_matches(when, signals):
+        if self.relax_conditions.isdisjoint(self.active_conditions(signals)):
+            return relaxed
+        for (signal, expected), relax in self.relaxations:
+            value = signals.get(signal)
+            if value is not None and value == expected:
                 for entry in relax:
                     category = entry.get("category")
                     if category:
                         relaxed.add(category)
         return relaxed
 
-    def _condition_matches(self, when: Dict[str, object], signals: Dict[str, Optional[bool]]) -> bool:
-        signal = when.get("signal")
-        expected = when.get("equals")
-        if signal is None:
-            return False
-        value = signals.get(signal)
-        if value is None:
-            return False
-        return value == expected
-
-    def _eval_derivation(self, derivation: Dict[str, object], tags: Set[str]) -> Optional[bool]:
+    def _compile_derivation(self, derivation: Dict[str, object]) -> Derivation:
+        # Resolve the op and canonicalize tag operands once at load; evaluating a
+        # signal is then a direct call with no per-call dispatch on the op name.
         op = derivation.get("op")
         args = derivation.get("args") or {}
         if op == "tag_present":
             tag = _canonicalize_tag(args.get("tag", ""))
-            return tag in tags
+            return lambda tags: tag in tags
         if op == "not":
-            nested = self._eval_derivation(args, tags)
-            return None if nested is None else not nested
-        return None
+            inner = self._compile_derivation(args)
+
+            def negate(tags: Set[str]) -> Optional[bool]:
+                value = inner(tags)
+                return None if value is None else not value
+
+            return negate
+        return lambda tags: None
 
     def _soft_category_for_freeform(self, canonical: str) -> Optional[str]:
-        for category in self.categories.values():
-            if not category.allows_freeform:
-                continue
-            if category.id == "arm_hand_position" and ("arm" in canonical or "hand" in canonical):
-                return category.id
+        for substrings, category_id in self._freeform_substring_rules:
+            if any(sub in canonical for sub in substrings):
+                return category_id
         return None
 
 
+@lru_cache(maxsize=8)
+def _load_spec(
+    taxonomy_path: Path,
+    applicability_path: Path,
+    policy_path: Path,
+    stamps: Tuple[int, int, int],
+) -> TaggingSpec:
+    # stamps (the three files' mtime_ns) is part of the key so edited spec files are re-read.
+    return TaggingSpec(
+        taxonomy_path=taxonomy_path,
+        applicability_path=applicability_path,
+        policy_path=policy_path,
+    )
+
+
 class TaggingRulesEngine:
     def __init__(self, spec: TaggingSpec):
         self.spec = spec
 
     @classmethod
     def from_default_files(cls) -> "TaggingRulesEngine":
-        base = Path(__file__).resolve().parents[2]
+        base = PACKAGE_DIR.parent
         taxonomy_path = base / "docs" / "tagging" / "taxonomy.v1.json"
         applicability_path = base / "docs" / "tagging" / "applicability_graph.v1.json"
         policy_path = base / "docs" / "tagging" / "policy.webapp.v1.json"
-        spec = TaggingSpec(
-            taxonomy_path=taxonomy_path,
-            applicability_path=applicability_path,
-            policy_path=policy_path,
+        stamps = (
+            taxonomy_path.stat().st_mtime_ns,
+            applicability_path.stat().st_mtime_ns,
+            policy_path.stat().st_mtime_ns,
         )
-        return cls(spec)
+        return cls(_load_spec(taxonomy_path, applicability_path, policy_path, stamps))
 
     def evaluate(self, tags: List[str], external_signals: Optional[Dict[str, Optional[bool]]] = None) -> Dict[str, List[str]]:
-        normalized = [_canonicalize_tag(tag) for tag in tags if str(tag).strip()]
-        tag_set = set(normalized)
-        categorized = self.spec.categorize_tags(normalized)
+        # One canonicalizing pass; categorization and signals both work off the set, so a
+        # tag repeated in the input (e.g. "smile" and "Smile") counts once.
+        tag_set = {_canonicalize_tag(tag) for tag in tags}
+        tag_set.discard("")
+        category_counts = self.spec.count_categories_canonical(tag_set)
         signals = self.spec.evaluate_signals(tag_set, external_signals or {})
         relaxed_categories = self.spec.relaxed_categories(signals)
-        hints = self._build_hints(categorized, signals, relaxed_categories, tag_set)
+        hints = self._build_hints(category_counts, signals, relaxed_categories, tag_set)
         return hints
 
     def categorize(self, tags: List[str]) -> Dict[str, List[str]]:
         normalized = [_canonicalize_tag(tag) for tag in tags if str(tag).strip()]
-        return self.spec.categorize_tags(normalized)
+        return self.spec.categorize_tags_canonical(normalized)
 
     def hint_options(self, category_id: str) -> Dict[str, object]:
         category = self.spec.categories.get(category_id)
         if not category:
             return {"category": category_id, "options": [], "allows_freeform": False}
 
-        options: List[str] = []
-        for value in category.preferred_values_raw:
-            if value not in options:
-                options.append(value)
-        for value in category.allowed_values_raw:
-            if value not in options:
-                options.append(value)
-
-        return {"category": category_id, "options": options, "allows_freeform": category.allows_freeform}
+        return {
+            "category": category_id,
+            "options": list(category.hint_option_values),
+            "allows_freeform": category.allows_freeform,
+        }
 
     def _build_hints(
         self,
-        categorized: Dict[str, List[str]],
+        category_counts: Dict[str, int],
         signals: Dict[str, Optional[bool]],
         relaxed_categories: Set[str],
         tag_set: Set[str],
     ) -> Dict[str, List[str]]:
-        buckets: Dict[str, List[str]] = {
-            "missing_required": [],
-            "possibly_missing": [],
-            "not_required": [],
+        # Dicts keyed by name act as insertion-ordered sets, so repeats collapse as they are added.
+        buckets: Dict[str, Dict[str, None]] = {
+            _MISSING_REQUIRED: {},
+            _POSSIBLY_MISSING: {},
+            _NOT_REQUIRED: {},
         }
-        forbidden: List[str] = []
-        invalid: List[str] = []
-        info: List[str] = []
-
+        forbidden: Dict[str, None] = {}
+        invalid: Dict[str, None] = {}
+        info: Dict[str, None] = {}
+
+        # Bind spec/policy attributes once; the loops below run per category and per tag.
+        spec = self.spec
+        policy = spec.policy
+        categories = spec.categories
+        effective_singletons = spec.effective_singletons
+        route = self._route_condition
+        has_missing_rule = policy.has_category_missing_rule
+        missing_severity = policy.cached_missing_severity
+        signals_key = tuple(sorted(signals.items()))
+        tag_severity_for = policy.tag_severity
+
+        active = spec.active_conditions(signals)
         requirements_by_category: Dict[str, List[int]] = {}
-        for when, requirements in self.spec.require_constraints:
-            if not self.spec._condition_matches(when, signals):
+        require_constraints = spec.require_constraints if not spec.require_conditions.isdisjoint(active) else ()
+        for (signal, expected), requirements in require_constraints:
+            value = signals.get(signal)
+            if value is None or value != expected:
                 continue
             for requirement in requirements:
                 category = requirement.get("category")
@@ -313,39 +459,43 @@ class TaggingRulesEngine:
                 requirements_by_category.setdefault(category, []).append(minimum)
                 if maximum is not None:
                     maximum_count = int(maximum)
-                    if len(categorized.get(category, [])) > maximum_count:
-                        self._route_condition(
+                    if category_counts.get(category, 0) > maximum_count:
+                        route(
                             category,
                             condition_type="invalid",
-                            severity=self.spec.policy.severity_for_condition("invalid"),
+                            severity=policy.severity_for_condition("invalid"),
                             relaxed=False,
                             buckets=buckets,
                         )
-                        invalid.append(category)
+                        invalid[category] = None
 
-        for when, forbidden_tags in self.spec.forbidden_constraints:
-            if not self.spec._condition_matches(when, signals):
+        forbidden_constraints = spec.forbidden_constraints if not spec.forbidden_conditions.isdisjoint(active) else ()
+        for (signal, expected), forbidden_tags, forbidden_set in forbidden_constraints:
+            value = signals.get(signal)
+            if value is None or value != expected or forbidden_set.isdisjoint(tag_set):
                 continue
             for tag in forbidden_tags:
                 if tag in tag_set:
-                    severity = self.spec.policy.severity_for_condition("forbidden")
-                    self._route_condition(
+                    severity = policy.severity_for_condition("forbidden")
+                    route(
                         tag,
                         condition_type="forbidden",
                         severity=severity,
                         relaxed=False,
                         buckets=buckets,
                     )
-                    forbidden.append(tag)
-
-        for category, tags in categorized.items():
-            max_count = self.spec.categories.get(category).cardinality_max
-            if category in self.spec.singleton_categories or max_count == 1:
-                if len(tags) > 1:
-                    invalid.append(category)
-
-        for category_id, definition in self.spec.categories.items():
-            present = len(categorized.get(category_id, []))
+                    forbidden[tag] = None
+
+        singleton_violations = []
+        for category, count in category_counts.items():
+            if count > 1 and category in effective_singletons:
+                singleton_violations.append(category)
+        # category_counts is keyed in tag order; report violations in taxonomy order.
+        singleton_violations.sort(key=spec.category_rank.__getitem__)
+        invalid.update(dict.fromkeys(singleton_violations))
+
+        for category_id, definition in categories.items():
+            present = category_counts.get(category_id, 0)
             required_minimum = max(
                 [definition.cardinality_min] + requirements_by_category.get(category_id, [])
                 or [0]
@@ -354,7 +504,7 @@ class TaggingRulesEngine:
             triggered = category_id in requirements_by_category
             relaxed = category_id in relaxed_categories
 
-            should_check = required or triggered or self.spec.policy.has_category_missing_rule(category_id)
+            should_check = required or triggered or has_missing_rule(category_id)
             if not should_check:
                 continue
 
@@ -367,45 +517,46 @@ class TaggingRulesEngine:
             if not missing_expected:
                 continue
 
-            severity = self.spec.policy.missing_severity(
+            severity = missing_severity(
                 category_id,
+                signals_key,
                 signals=signals,
                 relaxed=relaxed,
                 required=required,
                 triggered=triggered,
             )
-            self._route_condition(
+            route(
                 category_id,
-                condition_type="missing_required",
+                condition_type=_MISSING_REQUIRED,
                 severity=severity,
                 relaxed=relaxed,
                 buckets=buckets,
             )
 
         for tag in tag_set:
-            tag_severity = self.spec.policy.tag_severity(tag)
+            tag_severity = tag_severity_for(tag)
             if not tag_severity:
                 continue
-            self._route_condition(
+            route(
                 tag,
                 condition_type="info",
                 severity=tag_severity,
                 relaxed=False,
                 buckets=buckets,
             )
-            info.append(tag)
+            info[tag] = None
 
         hints = {
-            "missing_required": _dedupe_preserve(buckets["missing_required"]),
-            "possibly_missing": _dedupe_preserve(buckets["possibly_missing"]),
-            "not_required": _dedupe_preserve(buckets["not_required"]),
+            _MISSING_REQUIRED: list(buckets[_MISSING_REQUIRED]),
+            _POSSIBLY_MISSING: list(buckets[_POSSIBLY_MISSING]),
+            _NOT_REQUIRED: list(buckets[_NOT_REQUIRED]),
         }
         if forbidden:
-            hints["forbidden"] = _dedupe_preserve(forbidden)
+            hints["forbidden"] = list(forbidden)
         if invalid:
-            hints["invalid"] = _dedupe_preserve(invalid)
+            hints["invalid"] = list(invalid)
         if info:
-            hints["info"] = _dedupe_preserve(info)
+            hints["info"] = list(info)
         return hints
 
     def _route_condition(
@@ -415,36 +566,20 @@ class TaggingRulesEngine:
         condition_type: str,
         severity: Optional[str],
         relaxed: bool,
-        buckets: Dict[str, List[str]],
+        buckets: Dict[str, Dict[str, None]],
     ) -> None:
         if severity is None:
             return
-        if relaxed and condition_type == "missing_required":
-            buckets["not_required"].append(category)
+        if relaxed and condition_type == _MISSING_REQUIRED:
+            buckets[_NOT_REQUIRED][category] = None
             return
 
-        if condition_type in {"forbidden", "invalid"}:
+        if condition_type == "forbidden" or condition_type == "invalid":
             if severity == "ignore":
-                buckets["not_required"].append(category)
+                buckets[_NOT_REQUIRED][category] = None
             return
 
-        mapping = {
-            "error": "missing_required",
-            "warning": "possibly_missing",
-            "ignore": "not_required",
-            "info": "possibly_missing",
-        }
-        bucket = mapping.get(severity)
+        bucket = _SEVERITY_BUCKETS.get(severity)
         if not bucket:
             return
-        buckets[bucket].append(category)
-
-
-def _dedupe_preserve(items: List[str]) -> List[str]:
-    seen: Set[str] = set()
-    deduped: List[str] = []
-    for item in items:
-        if item not in seen:
-            seen.add(item)
-            deduped.append(item)
-    return deduped
+        buckets[bucket][category] = None
@@ -0,0 +1,128 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.deps import get_config_service, get_dataset_manager
+from app.main import app
+from app.services.config_service import ConfigService
+from app.services.dataset_manager import DatasetManager
+
+
+@pytest.fixture
+def services(tmp_path):
+    config = ConfigService(tmp_path / "config")
+    data_root = tmp_path / "data"
+    (data_root / "set").mkdir(parents=True)
+    for name in ("a", "b", "c"):
+        (data_root / "set" / f"{name}.png").write_bytes(b"")
+        (data_root / "set" / f"{name}.txt").write_text("one", encoding="utf-8")
+    config.save_dataset_root(data_root)
+    manager = DatasetManager(config)
+    manager.load_dataset("set")
+    app.dependency_overrides[get_config_service] = lambda: config
+    app.dependency_overrides[get_dataset_manager] = lambda: manager
+    yield config, manager
+    app.dependency_overrides.clear()
+
+
+def _ids_by_name(manager):
+    return {image.rel_path: image.image_id for image in manager.images.values()}
+
+
+def test_json_and_form_bodies_validate_the_same_payload(services):
+    config, _ = services
+    client = TestClient(app)
+
+    assert client.post("/api/undesired/add", json={"tag": "json tag"}).status_code == 200
+    assert client.post("/api/undesired/add", data={"tag": "form tag"}).status_code == 200
+
+    assert config.load_undesired_tags() == ["json tag", "form tag"]
+
+
+def test_bulk_form_reads_bracketed_keys_and_repeated_ids(services):
+    _, manager = services
+    ids = _ids_by_name(manager)
+    client = TestClient(app)
+
+    response = client.post(
+        "/api/ops/bulk",
+        data={
+            "scope[mode]": "selected",
+            "op[type]": "add",
+            "op[tag]": "two",
+            "selected_image_ids": [ids["a.png"], ids["c.png"]],
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["affected_images"] == 2
+    assert manager.images[ids["a.png"]].tags_current == ["one", "two"]
+    assert manager.images[ids["b.png"]].tags_current == ["one"]
+    assert manager.images[ids["c.png"]].tags_current == ["one", "two"]
+
+
+def test_form_accepts_single_and_repeated_tags(services):
+    _, manager = services
+    ids = _ids_by_name(manager)
+    client = TestClient(app)
+
+    client.post(f"/api/image/{ids['a.png']}/analyze", data={"action": "stage_adds", "tags": "two"})
+    client.post(f"/api/image/{ids['b.png']}/analyze", data={"action": "stage_adds", "tags": ["two", "three"]})
+
+    assert manager.images[ids["a.png"]].tags_current == ["one", "two"]
+    assert manager.images[ids["b.png"]].tags_current == ["one", "two", "three"]
+
+
+def test_complete_form_value_uses_truthy_spellings(services):
+    _, manager = services
+    ids = _ids_by_name(manager)
+    client = TestClient(app)
+
+    client.post(f"/api/image/{ids['a.png']}/complete", data={"complete": "on"})
+    client.post(f"/api/image/{ids['b.png']}/complete", data={"complete": "nope"})
+
+    assert manager.images[ids["a.png"]].is_complete is True
+    assert manager.images[ids["b.png"]].is_complete is False
+
+
+def test_image_ops_accept_loose_json_tags(services):
+    _, manager = services
+    ids = _ids_by_name(manager)
+    client = TestClient(app)
+    url = f"/api/image/{ids['a.png']}/ops"
+
+    assert client.post(url, json={"type": "add_many", "tags": "foo"}).status_code == 200
+    assert client.post(url, json={"type": "add_many", "tags": ["bar", 1]}).status_code == 200
+    assert client.post(url, json={"type": "add_many", "tags": None}).status_code == 200
+    assert client.post(url, json={"type": "add", "tag": None}).status_code == 200
+
+    assert manager.images[ids["a.png"]].tags_current == ["one", "foo", "bar", "1"]
+
+
+def test_bulk_op_accepts_null_fields(services):
+    _, manager = services
+    client = TestClient(app)
+
+    response = client.post(
+        "/api/ops/bulk",
+        json={"scope": {"mode": "all"}, "op": {"type": "replace", "tag": None, "old_tag": None, "new_tag": None}},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["summary"]["replaced"] == 0
+    assert all(image.tags_current == ["one"] for image in manager.images.values())
+
+
+def test_invalid_payload_returns_400(services):
+    _, manager = services
+    ids = _ids_by_name(manager)
+    client = TestClient(app)
+
+    response = client.post(
+        f"/api/image/{ids['a.png']}/ops", json={"type": "edit", "new_tag": "two", "index": "first"}
+    )
+
+    assert response.status_code == 400
+    error = response.json()["error"]
+    assert error["code"] == "INVALID_PAYLOAD"
+    assert error["message"].startswith("index")
+    assert manager.images[ids["a.png"]].tags_current == ["one"]
@@ -42,6 +42,55 @@ class ConfigServiceTests(unittest.TestCase):
             self.assertEqual(payload, {"tags": ["cat", "DOG"]})
             self.assertFalse(path.with_suffix(path.suffix + ".tmp").exists())
 
+    def test_reload_picks_up_external_edits(self):
+        with TemporaryDirectory() as tmp:
+            base_dir = Path(tmp) / "config"
+            service = ConfigService(base_dir=base_dir)
+            service.save_undesired_tags(["cat"])
+            self.assertEqual(service.load_undesired_tags(), ["cat"])
+
+            path = base_dir / "undesired_tags.json"
+            path.write_text(json.dumps({"tags": ["cat", "dog", "bird"]}), encoding="utf-8")
+
+            self.assertEqual(service.load_undesired_tags(), ["cat", "dog", "bird"])
+
+    def test_canonical_undesired_file_is_not_rewritten(self):
+        with TemporaryDirectory() as tmp:
+            base_dir = Path(tmp) / "config"
+            base_dir.mkdir(parents=True, exist_ok=True)
+            path = base_dir / "undesired_tags.json"
+            path.write_text('{"tags": ["cat", "dog"]}', encoding="utf-8")
+
+            service = ConfigService(base_dir=base_dir)
+            self.assertEqual(service.load_undesired_tags(), ["cat", "dog"])
+            self.assertEqual(path.read_text(encoding="utf-8"), '{"tags": ["cat", "dog"]}')
+
+            path.write_text('{"tags": [" cat ", "", "dog"]}', encoding="utf-8")
+            self.assertEqual(service.load_undesired_tags(), ["cat", "dog"])
+            self.assertEqual(json.loads(path.read_text(encoding="utf-8")), {"tags": ["cat", "dog"]})
+
+    def test_undesired_lower_tracks_saves(self):
+        with TemporaryDirectory() as tmp:
+            service = ConfigService(base_dir=Path(tmp) / "config")
+            service.save_undesired_tags(["Cat", " DOG "])
+            self.assertEqual(service.undesired_tags_lower, frozenset({"cat", "dog"}))
+
+            service.save_undesired_tags(["bird"])
+            self.assertEqual(service.undesired_tags_lower, frozenset({"bird"}))
+
+    def test_cached_config_is_not_shared_with_callers(self):
+        with TemporaryDirectory() as tmp:
+            base_dir = Path(tmp) / "config"
+            service = ConfigService(base_dir=base_dir)
+
+            first = service.load_config()
+            first["dataset_root"] = "mutated"
+            first["lm_studio"]["enabled"] = True
+
+            second = service.load_config()
+            self.assertEqual(second["dataset_root"], "")
+            self.assertFalse(second["lm_studio"]["enabled"])
+
     def test_merges_lm_studio_override(self):
         with TemporaryDirectory() as tmp:
             base_dir = Path(tmp) / "config"
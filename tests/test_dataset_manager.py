@@ -1,3 +1,8 @@
+import hashlib
+
+import pytest
+from fastapi import HTTPException
+
 from app.models import FilterCriteria, ImageData
 from app.services.config_service import ConfigService
 from app.services.dataset_manager import DatasetManager
@@ -80,3 +85,195 @@ def test_complete_flag_hides_missing_required_in_filter(tmp_path):
     filtered = list(manager._filtered_images(filters))
     assert len(filtered) == 1
     assert filtered[0].image_id == "img1"
+
+
+def test_tag_diffs_follow_staged_edits(tmp_path):
+    manager = _dummy_manager(tmp_path)
+    img_path = tmp_path / "data" / "img.png"
+    img_path.parent.mkdir(parents=True, exist_ok=True)
+    img_path.write_bytes(b"")
+
+    manager.images["img1"] = ImageData(
+        image_id="img1",
+        rel_path="img.png",
+        abs_path=img_path,
+        tags_original=["A", "b"],
+        tags_current=["A", "b"],
+    )
+    image = manager.images["img1"]
+    assert image.tags_current_lower == ("a", "b")
+
+    manager.stage_image_edit("img1", {"type": "add", "tag": "C"})
+    manager.stage_image_edit("img1", {"type": "delete", "tag": "b"})
+
+    assert image.added_tags() == ["C"]
+    assert image.removed_tags() == ["b"]
+    assert image.tags_current_lower == ("a", "c")
+
+    manager.discard_changes()
+    assert image.added_tags() == []
+    assert image.tags_current_lower == ("a", "b")
+
+
+def test_load_dataset_finds_nested_images(tmp_path):
+    config = ConfigService(tmp_path / "config")
+    data_root = tmp_path / "data"
+    (data_root / "set" / "nested").mkdir(parents=True)
+    (data_root / "set" / "b.PNG").write_bytes(b"")
+    (data_root / "set" / "b.txt").write_text("smile, cat", encoding="utf-8")
+    (data_root / "set" / "nested" / "a.jpg").write_bytes(b"")
+    (data_root / "set" / "notes.txt").write_text("ignored", encoding="utf-8")
+    config.save_dataset_root(data_root)
+    manager = DatasetManager(config)
+
+    assert manager.browse("")["summary"]["eligible_image_count_recursive"] == 2
+
+    result = manager.load_dataset("set")
+    assert result["image_count"] == 2
+    images = list(manager.images.values())
+    assert [image.rel_path for image in images] == ["b.PNG", "nested/a.jpg"]
+    assert images[0].tags_current == ["smile", "cat"]
+    assert images[1].tags_current == []
+
+
+def test_legacy_sha1_image_ids_still_resolve(tmp_path):
+    config = ConfigService(tmp_path / "config")
+    data_root = tmp_path / "data"
+    (data_root / "set").mkdir(parents=True)
+    (data_root / "set" / "a.png").write_bytes(b"")
+    config.save_dataset_root(data_root)
+    manager = DatasetManager(config)
+    manager.load_dataset("set")
+
+    image_id = hashlib.blake2b(b"a.png", digest_size=16).hexdigest()
+    assert list(manager.images) == [image_id]
+
+    legacy_id = hashlib.sha1(b"a.png").hexdigest()
+    assert manager.get_image(legacy_id).image_id == image_id
+    assert manager.get_image_tags(legacy_id)["image_id"] == image_id
+    assert manager.stage_image_edit(legacy_id, {"type": "add", "tag": "new"})["image_id"] == image_id
+    assert manager.set_image_complete(legacy_id, True)["image_id"] == image_id
+    assert manager.analyze_image(legacy_id)["current_tags"] == ["new"]
+    assert manager.images[image_id].is_complete
+
+
+def test_neighbor_ids_follow_load_order(tmp_path):
+    config = ConfigService(tmp_path / "config")
+    data_root = tmp_path / "data"
+    (data_root / "set").mkdir(parents=True)
+    for name in ("c.png", "a.png", "b.png"):
+        (data_root / "set" / name).write_bytes(b"")
+    config.save_dataset_root(data_root)
+    manager = DatasetManager(config)
+    manager.load_dataset("set")
+
+    first, middle, last = [image.image_id for image in manager.images.values()]
+    assert manager.get_neighbor_ids(first) == {"previous": None, "next": middle}
+    assert manager.get_neighbor_ids(middle) == {"previous": first, "next": last}
+    assert manager.get_neighbor_ids(last) == {"previous": middle, "next": None}
+
+
+def test_tags_match_compares_multisets(tmp_path):
+    manager = DatasetManager(ConfigService(tmp_path / "config"))
+
+    assert manager._tags_match(["b", "a", "a"], ["a", "a", "b"])
+    assert not manager._tags_match(["a", "a", "b"], ["a", "b", "b"])
+    assert not manager._tags_match(["a", "b"], ["a", "b", "c"])
+
+
+def test_summary_can_skip_hints(tmp_path):
+    manager = _dummy_manager(tmp_path)
+    manager.dataset_path = tmp_path / "data"
+    manager.dataset_rel = ""
+    manager.images["img1"] = ImageData(
+        image_id="img1",
+        rel_path="img.png",
+        abs_path=tmp_path / "data" / "img.png",
+        tags_original=["a"],
+        tags_current=["a"],
+    )
+
+    with_hints = manager.get_dataset_summary(FilterCriteria(has_missing_required=True))
+    assert with_hints.images[0]["hints"]["missing_required"]
+
+    without_hints = manager.get_dataset_summary(include_hints=False)
+    assert "hints" not in without_hints.images[0]
+    assert without_hints.tags == [{"tag": "a", "count": 1, "is_undesired": False}]
+
+
+def test_apply_changes_writes_sidecars(tmp_path):
+    config = ConfigService(tmp_path / "config")
+    data_root = tmp_path / "data"
+    (data_root / "set").mkdir(parents=True)
+    for name in ("a.png", "b.png"):
+        (data_root / "set" / name).write_bytes(b"")
+    (data_root / "set" / "a.txt").write_text("old", encoding="utf-8")
+    config.save_dataset_root(data_root)
+    manager = DatasetManager(config)
+    manager.load_dataset("set")
+
+    first, second = manager.images.values()
+    manager.stage_image_edit(first.image_id, {"type": "add", "tag": "new"})
+
+    assert manager.apply_changes() == {"applied": True, "written_files": 1}
+    assert (data_root / "set" / "a.txt").read_text(encoding="utf-8") == "old, new"
+    assert not (data_root / "set" / "b.txt").exists()
+    assert not list((data_root / "set").glob("*.tmp"))
+    assert not first.is_dirty()
+
+
+def test_browse_rejects_symlink_escaping_root(tmp_path):
+    config = ConfigService(tmp_path / "config")
+    data_root = tmp_path / "data"
+    data_root.mkdir()
+    (tmp_path / "outside").mkdir()
+    (data_root / "escape").symlink_to(tmp_path / "outside", target_is_directory=True)
+    config.save_dataset_root(data_root)
+    manager = DatasetManager(config)
+
+    with pytest.raises(HTTPException) as excinfo:
+        manager.browse("escape")
+    assert excinfo.value.status_code == 403
+
+
+def test_load_skips_symlinked_images_escaping_dataset(tmp_path):
+    config = ConfigService(tmp_path / "config")
+    data_root = tmp_path / "data"
+    (data_root / "set").mkdir(parents=True)
+    (data_root / "set" / "own.png").write_bytes(b"")
+    (data_root / "set" / "alias.png").symlink_to(data_root / "set" / "own.png")
+    (tmp_path / "secret").mkdir()
+    (tmp_path / "secret" / "private.png").write_bytes(b"")
+    (data_root / "set" / "leak.png").symlink_to(tmp_path / "secret" / "private.png")
+    config.save_dataset_root(data_root)
+    manager = DatasetManager(config)
+
+    manager.load_dataset("set")
+
+    assert sorted(image.rel_path for image in manager.images.values()) == ["alias.png", "own.png"]
+    assert manager.browse("set")["summary"]["eligible_image_count_recursive"] == 2
+
+
+def test_reload_picks_up_edited_sidecar(tmp_path):
+    config = ConfigService(tmp_path / "config")
+    data_root = tmp_path / "data"
+    (data_root / "set").mkdir(parents=True)
+    (data_root / "set" / "a.png").write_bytes(b"")
+    tag_file = data_root / "set" / "a.txt"
+    tag_file.write_text("one, two", encoding="utf-8")
+    config.save_dataset_root(data_root)
+    manager = DatasetManager(config)
+
+    manager.load_dataset("set")
+    (image,) = manager.images.values()
+    assert image.tags_current == ["one", "two"]
+
+    manager.stage_image_edit(image.image_id, {"type": "add", "tag": "three"})
+    manager.load_dataset("set")
+    (image,) = manager.images.values()
+    assert image.tags_current == ["one", "two"]
+
+    tag_file.write_text("one, two, four", encoding="utf-8")
+    manager.load_dataset("set")
+    (image,) = manager.images.values()
+    assert image.tags_current == ["one", "two", "four"]
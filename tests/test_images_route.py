@@ -0,0 +1,53 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.deps import get_config_service, get_dataset_manager
+from app.main import app
+from app.routes.images import _validate_image_path
+from app.services.config_service import ConfigService
+from app.services.dataset_manager import DatasetManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    config = ConfigService(tmp_path / "config")
+    data_root = tmp_path / "data"
+    (data_root / "set").mkdir(parents=True)
+    (data_root / "set" / "a.png").write_bytes(b"first")
+    config.save_dataset_root(data_root)
+    manager = DatasetManager(config)
+    manager.load_dataset("set")
+    app.dependency_overrides[get_config_service] = lambda: config
+    app.dependency_overrides[get_dataset_manager] = lambda: manager
+    yield manager
+    app.dependency_overrides.clear()
+
+
+def test_full_image_is_revalidated_on_every_request(manager):
+    (image_id,) = manager.images
+    client = TestClient(app)
+
+    first = client.get(f"/img/full/{image_id}")
+    assert first.headers["cache-control"] == "no-cache"
+    revalidated = client.get(f"/img/full/{image_id}", headers={"If-None-Match": first.headers["etag"]})
+    assert revalidated.status_code == 304
+
+    manager.images[image_id].abs_path.write_bytes(b"replaced")
+    changed = client.get(f"/img/full/{image_id}", headers={"If-None-Match": first.headers["etag"]})
+    assert changed.status_code == 200
+    assert changed.content == b"replaced"
+
+
+def test_image_path_check_rejects_symlink_escaping_dataset(tmp_path):
+    dataset = tmp_path / "data" / "set"
+    dataset.mkdir(parents=True)
+    (tmp_path / "secret").mkdir()
+    (tmp_path / "secret" / "private.png").write_bytes(b"")
+    (dataset / "leak.png").symlink_to(tmp_path / "secret" / "private.png")
+    (dataset / "own.png").write_bytes(b"")
+
+    _validate_image_path(dataset / "own.png", dataset.resolve())
+    with pytest.raises(HTTPException) as excinfo:
+        _validate_image_path(dataset / "leak.png", dataset.resolve())
+    assert excinfo.value.status_code == 403
@@ -1,3 +1,6 @@
+import base64
+import os
+
 import pytest
 
 from app.services.lmstudio_service import LmStudioInvalidResponseError, LmStudioService
@@ -19,3 +22,29 @@ def test_parse_first_line_tags_applies_exclusions_and_trimming():
     output = " keep , DROP , drop,New "
     tags = LmStudioService.parse_first_line_tags(output, exclusions=["drop"])
     assert tags == ["keep", "new"]
+
+
+def test_build_payload_reencodes_changed_image(tmp_path):
+    image_path = tmp_path / "img.jpg"
+    image_path.write_bytes(b"first")
+    service = LmStudioService()
+
+    first = service._build_payload(image_path, ["a"])
+    image_path.write_bytes(b"second!")
+    os.utime(image_path, ns=(0, image_path.stat().st_mtime_ns + 1_000_000))
+    second = service._build_payload(image_path, ["a"])
+
+    first_url = first["messages"][1]["content"][1]["image_url"]["url"]
+    second_url = second["messages"][1]["content"][1]["image_url"]["url"]
+    assert first_url.endswith(base64.b64encode(b"first").decode("utf-8"))
+    assert second_url.endswith(base64.b64encode(b"second!").decode("utf-8"))
+
+
+@pytest.mark.parametrize("token", ["ok_tag", "two words", "dash-ed", "a1", "bad!", "tab\there", "café", "x.y"])
+def test_token_check_matches_token_pattern(token):
+    output = f"{token}, fine"
+    if LmStudioService.TOKEN_PATTERN.match(token):
+        assert LmStudioService.parse_first_line_tags(output)[0] == token
+    else:
+        with pytest.raises(LmStudioInvalidResponseError):
+            LmStudioService.parse_first_line_tags(output)
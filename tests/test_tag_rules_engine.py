@@ -1,6 +1,7 @@
 import unittest
 
 from app.services.tag_service import TagService
+from app.services.tagging_rules import TaggingRulesEngine, _canonicalize_tag
 
 
 class TagRulesEngineTests(unittest.TestCase):
@@ -93,6 +94,52 @@ class TagRulesEngineTests(unittest.TestCase):
         self.assertIn("info", hints)
         self.assertIn("identity token", hints["info"])
 
+    def test_cached_hints_are_independent_copies(self):
+        first = TagService.compute_hints(["front view"])
+        first["missing_required"].append("mutated")
+
+        second = TagService.compute_hints(("front view",))
+
+        self.assertNotIn("mutated", second["missing_required"])
+        self.assertIn("gaze", second["missing_required"])
+
+    def test_shared_hints_reuse_cached_mapping(self):
+        first = TagService.shared_hints(["smile", "frown"])
+        second = TagService.shared_hints(("smile", "frown"))
+
+        self.assertIs(first, second)
+        self.assertIn("expression", first["invalid"])
+        with self.assertRaises(TypeError):
+            first["invalid"] = ()
+        with self.assertRaises(AttributeError):
+            first["invalid"].append("mutated")
+
+    def test_repeated_tag_spellings_count_once(self):
+        hints = TagService.compute_hints(["close-up", "close up", "front view"])
+
+        self.assertNotIn("framing", hints.get("invalid", []))
+
+    def test_canonicalization_is_idempotent(self):
+        for raw in ["Close-Up", "  hands  on-hips ", "1girl", "FROM behind", 42]:
+            canonical = _canonicalize_tag(raw)
+            self.assertEqual(_canonicalize_tag(canonical), canonical)
+
+    def test_default_engines_share_loaded_spec(self):
+        first = TaggingRulesEngine.from_default_files()
+        second = TaggingRulesEngine.from_default_files()
+
+        self.assertIs(first.spec, second.spec)
+
+    def test_hint_options_list_preferred_values_first(self):
+        engine = TaggingRulesEngine.from_default_files()
+        category = engine.spec.categories["framing"]
+        options = engine.hint_options("framing")["options"]
+
+        self.assertEqual(len(options), len(set(options)))
+        self.assertEqual(options[: len(category.preferred_values_raw)], list(dict.fromkeys(category.preferred_values_raw)))
+        options.append("scratch")
+        self.assertNotIn("scratch", engine.hint_options("framing")["options"])
+
 
 if __name__ == "__main__":  # pragma: no cover
     unittest.main()